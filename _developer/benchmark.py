@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;database
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;mpl2
+----------------------------------------------------------------------------
+benchmark.py
+
+Benchmarks the pas_database hot paths against a local SQLite file or a
+given database URL. Results are reported as operations per second and
+memory retained per operation. Use "--output" to write them JSON encoded for
+trend tracking.
+
+Usage: python _developer/benchmark.py [--url URL] [--iterations N]
+                                      [--filter NAME] [--output FILE]
+"""
+
+# pylint: disable=import-error, import-outside-toplevel
+
+from argparse import ArgumentParser
+from os import makedirs, path
+from tempfile import TemporaryDirectory
+from time import perf_counter, time
+import json
+import platform
+import sys
+import tracemalloc
+
+from dpt_file import File
+from dpt_runtime.io_exception import IOException
+from dpt_settings import Settings
+
+def _apply_sql_file(context):
+    """
+Benchmark case for "Schema._apply_sql_file()".
+
+:since: v1.0.0
+    """
+
+    from pas_database import Schema, TransactionContext
+
+    with TransactionContext(): Schema._apply_sql_file(context['sql_file_path_name']) # pylint: disable=protected-access
+#
+
+def _condition_definition_apply(context):
+    """
+Benchmark case for "ConditionDefinition.apply()".
+
+:since: v1.0.0
+    """
+
+    from pas_database import ConditionDefinition
+    from pas_database.orm.key_store import KeyStore as _DbKeyStore
+
+    condition_definition = ConditionDefinition(ConditionDefinition.AND)
+    condition_definition.add_exact_match_condition("key", "benchmark_{0:d}".format(context['counter']))
+    condition_definition.add_greater_than_match_condition("validity_end_time", 0)
+
+    with context['connection'] as connection: condition_definition.apply(_DbKeyStore, connection.query(_DbKeyStore))
+#
+
+def _connection_context(context):
+    """
+Benchmark case for entering and exiting a "Connection" context.
+
+:since: v1.0.0
+    """
+
+    with context['connection']: pass
+#
+
+def _instance_attribute_access(context):
+    """
+Benchmark case for reading an "Instance" attribute.
+
+:since: v1.0.0
+    """
+
+    return context['key_store']['key']
+#
+
+def _instance_iterator(context, buffered):
+    """
+Benchmark case for iterating over all benchmark KeyStore entries.
+
+:param buffered: True to use the buffered iterator
+
+:since: v1.0.0
+    """
+
+    from pas_database.instances import KeyStore
+    from pas_database.orm.key_store import KeyStore as _DbKeyStore
+
+    with context['connection'] as connection:
+        result = connection.execute(connection.query(_DbKeyStore).statement)
+
+        iterator = (KeyStore.buffered_iterator(_DbKeyStore, result)
+                    if (buffered) else
+                    KeyStore.iterator(_DbKeyStore, result)
+                   )
+
+        for key_store in iterator: key_store['key']
+    #
+#
+
+def _key_store_load_key(context):
+    """
+Benchmark case for "KeyStore.load_key()".
+
+:since: v1.0.0
+    """
+
+    from pas_database.instances import KeyStore
+
+    KeyStore.load_key("benchmark_{0:d}".format(context['counter'] % context['entries']))
+#
+
+def _key_store_save(context):
+    """
+Benchmark case for "KeyStore.save()".
+
+:since: v1.0.0
+    """
+
+    key_store = context['key_store']
+    key_store.value_dict = { "counter": context['counter'] }
+    key_store.save()
+#
+
+def _init_database(context, entries):
+    """
+Creates the database tables and benchmark data.
+
+:param entries: Number of KeyStore entries to create
+
+:since: v1.0.0
+    """
+
+    from pas_database import Connection, TransactionContext
+    from pas_database.instances import KeyStore
+    from pas_database.orm import Abstract
+
+    connection = Connection.get_instance()
+    Abstract().metadata.create_all(Connection.get_engine())
+
+    with TransactionContext():
+        KeyStore.bulk_insert([ { "key": "benchmark_{0:d}".format(position),
+                                 "value": { "position": position },
+                                 "validity_start_time": int(time()),
+                                 "validity_end_time": int(time()) + 86400
+                               }
+                               for position in range(entries)
+                             ])
+    #
+
+    context['connection'] = connection
+    context['entries'] = entries
+    context['key_store'] = KeyStore.load_key("benchmark_0")
+
+    sql_file_path_name = path.join(context['directory'], "benchmark.sql")
+
+    sql_commands = [ "-- Benchmark schema file\n",
+                     "DROP TABLE IF EXISTS __db_prefix___benchmark;\n",
+                     "CREATE TABLE __db_prefix___benchmark (id INTEGER PRIMARY KEY, value VARCHAR(255));\n"
+                   ]
+
+    for position in range(entries):
+        sql_commands.append("INSERT INTO __db_prefix___benchmark (id, value) VALUES ({0:d}, 'Value {0:d}');\n".format(position))
+    #
+
+    _write_file(sql_file_path_name, "".join(sql_commands))
+
+    context['sql_file_path_name'] = sql_file_path_name
+#
+
+def _init_settings(directory, url):
+    """
+Initializes the settings required for the benchmark database.
+
+:param directory: Directory used for the settings and SQLite files
+:param url: Database URL; None for a SQLite file in the given directory
+
+:since: v1.0.0
+    """
+
+    settings_path = path.join(directory, "settings")
+    Settings.set("path_data", directory)
+
+    if (url is None): url = "sqlite:///{0}".format(path.join(directory, "benchmark.sqlite3"))
+    settings = { "pas_database_url": url, "pas_database_table_prefix": "benchmark" }
+
+    if (url.startswith("sqlite")):
+        settings['pas_database_threaded'] = False
+        settings['pas_database_transaction_use_native_nested'] = False
+    #
+
+    makedirs(settings_path)
+
+    _write_file(path.join(settings_path, "pas_database.json"), json.dumps(settings))
+#
+
+def _measure(case, context, iterations):
+    """
+Measures the given benchmark case.
+
+:param case: Benchmark case callable
+:param iterations: Number of iterations
+
+:return: (dict) Benchmark result
+:since:  v1.0.0
+    """
+
+    for context['counter'] in range(min(iterations, 10)): case(context)
+
+    started = perf_counter()
+    for context['counter'] in range(iterations): case(context)
+    duration = perf_counter() - started
+
+    allocation_iterations = max(1, iterations // 10)
+
+    tracemalloc.start()
+    snapshot_before = tracemalloc.take_snapshot()
+
+    for context['counter'] in range(allocation_iterations): case(context)
+
+    snapshot_after = tracemalloc.take_snapshot()
+    _, allocated_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    statistics = snapshot_after.compare_to(snapshot_before, "filename")
+
+    return { "iterations": iterations,
+             "seconds": duration,
+             "ops_per_sec": (iterations / duration if (duration > 0) else None),
+             "retained_blocks_per_op": sum(statistic.count_diff for statistic in statistics if statistic.count_diff > 0) / allocation_iterations,
+             "retained_bytes_per_op": sum(statistic.size_diff for statistic in statistics if statistic.size_diff > 0) / allocation_iterations,
+             "allocated_peak_bytes": allocated_peak
+           }
+#
+
+def main():
+    """
+Benchmark main entry point.
+
+:since: v1.0.0
+    """
+
+    arg_parser = ArgumentParser()
+    arg_parser.add_argument("--entries", default = 1000, type = int, dest = "entries")
+    arg_parser.add_argument("--filter", dest = "filter")
+    arg_parser.add_argument("--iterations", default = 1000, type = int, dest = "iterations")
+    arg_parser.add_argument("--output", dest = "output")
+    arg_parser.add_argument("--url", dest = "url")
+
+    args = arg_parser.parse_args()
+
+    cases = [ ( "connection_context", _connection_context, args.iterations ),
+              ( "instance_attribute_access", _instance_attribute_access, args.iterations * 10 ),
+              ( "key_store_load_key", _key_store_load_key, args.iterations ),
+              ( "key_store_save", _key_store_save, args.iterations ),
+              ( "instance_iterator_unbuffered", lambda context: _instance_iterator(context, False), max(1, args.iterations // 100) ),
+              ( "instance_iterator_buffered", lambda context: _instance_iterator(context, True), max(1, args.iterations // 100) ),
+              ( "condition_definition_apply", _condition_definition_apply, args.iterations ),
+              ( "schema_apply_sql_file", _apply_sql_file, max(1, args.iterations // 100) )
+            ]
+
+    results = { }
+
+    with TemporaryDirectory() as directory:
+        _init_settings(directory, args.url)
+
+        from pas_database import Connection
+
+        context = { "directory": directory }
+        _init_database(context, args.entries)
+
+        for name, case, iterations in cases:
+            if (args.filter is None or args.filter in name):
+                results[name] = _measure(case, context, iterations)
+
+                ops_per_sec = ("n/a"
+                               if (results[name]['ops_per_sec'] is None) else
+                               "{0:.1f}".format(results[name]['ops_per_sec'])
+                              )
+
+                sys.stdout.write("{0:<32} {1:>14} ops/s {2:>12.1f} B/op retained {3:>10.1f} blocks/op retained\n".format(name,
+                                                                                                       ops_per_sec,
+                                                                                                         results[name]['retained_bytes_per_op'],
+                                                                                                         results[name]['retained_blocks_per_op']
+                                                                                                        ))
+            #
+        #
+
+        backend_name = Connection.get_backend_name()
+    #
+
+    if (args.output is not None):
+        _write_file(args.output,
+                    json.dumps({ "timestamp": int(time()),
+                                 "python": platform.python_version(),
+                                 "platform": platform.platform(),
+                                 "backend": backend_name,
+                                 "entries": args.entries,
+                                 "results": results
+                               },
+                               indent = 2
+                              )
+                   )
+    #
+#
+
+def _write_file(file_path_name, data):
+    """
+Writes the given data to the file given.
+
+:param file_path_name: Path to the file to write
+:param data: File content
+
+:since: v1.0.0
+    """
+
+    file_object = File()
+
+    try:
+        if (not file_object.open(file_path_name, False, "w")): raise IOException("Failed to open '{0}' for writing".format(file_path_name))
+        file_object.write(data)
+    finally: file_object.close()
+#
+
+if (__name__ == "__main__"): main()
@@ -65,6 +65,10 @@ with TemporaryDirectory(dir = ".") as build_directory:
                "packages": [ "pas_database" ],
                "data_files": [ ( "docs", [ "LICENSE", "README" ]) ],
                "entry_points": { "console_scripts": [ "pas-database-tool = pas_database.__main__:main" ] },
+               "extras_require": { "asyncio": [ "SQLAlchemy[asyncio]>=1.4,<2" ],
+                                   "asyncio-postgresql": [ "SQLAlchemy[asyncio]>=1.4,<2", "asyncpg" ],
+                                   "asyncio-sqlite": [ "SQLAlchemy[asyncio]>=1.4,<2", "aiosqlite" ]
+                                 },
                "test_suite": "tests"
              }
 
@@ -17,13 +17,44 @@ https://www.direct-netware.de/redirect?licenses;mpl2
 #echo(__FILEPATH__)#
 """
 
+from importlib import import_module
+
 from .autoloading_polymorphic_map import AutoloadingPolymorphicMap
 from .condition_definition import ConditionDefinition
 from .connection import Connection
+from .connection_statistics import ConnectionStatistics
+from .explain import Explain
+from .fair_lock import FairLock
 from .instance import Instance
 from .lockable_mixin import LockableMixin
+from .lru_cache import LruCache
 from .nothing_matched_exception import NothingMatchedException
+from .read_only_context import ReadOnlyContext
 from .schema import Schema
 from .sort_definition import SortDefinition
 from .transaction_context import TransactionContext
 from .update_conflict_exception import UpdateConflictException
+
+_LAZY_IMPORTS = { "AsyncConnection": ".async_connection",
+                  "AsyncInstance": ".async_instance",
+                  "AsyncInstanceIterator": ".async_instance_iterator"
+                }
+"""
+Classes imported on first access only. The asyncio API requires SQLAlchemy
+1.4 or later.
+"""
+
+def __getattr__(name):
+    """
+python.org: Called when a module attribute lookup has not found the
+attribute in the usual places.
+
+:param name: Attribute name
+
+:return: (object) Lazily imported class
+:since:  v1.0.0
+    """
+
+    if (name not in _LAZY_IMPORTS): raise AttributeError("module '{0}' has no attribute '{1}'".format(__name__, name))
+    return getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+#
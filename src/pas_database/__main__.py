@@ -45,7 +45,7 @@ Tool to work with the configured database and its tables.
 
     # pylint: disable=unused-argument
 
-    SUPPORTED_COMMANDS = [ "applySchema" ]
+    SUPPORTED_COMMANDS = [ "applySchema", "cleanupKeyStore" ]
     """
 List of commands supported for this application
     """
@@ -74,6 +74,7 @@ True if this tool should handle the initial configuration.
 
         self.arg_parser = ArgumentParser()
         self.arg_parser.add_argument("command", choices = Application.SUPPORTED_COMMANDS)
+        self.arg_parser.add_argument("--dry-run", action = "store_true", dest = "dry_run")
         self.arg_parser.add_argument("-s", action = "store_true", dest = "cli_setup")
 
         InteractiveCli.register_run_callback(self._on_run)
@@ -130,6 +131,7 @@ Callback for execution.
         Hook.load("database")
 
         if (args.command == "applySchema"): self.run_apply_schema(args)
+        elif (args.command == "cleanupKeyStore"): self.run_cleanup_key_store(args)
     #
 
     def _on_shutdown(self):
@@ -142,6 +144,66 @@ Callback for shutdown.
         Hook.free()
     #
 
+    def _output_schema_plan(self, connection):
+        """
+Outputs tables to be created and pending schema upgrades with their
+estimated statements without applying them.
+
+:param connection: Connection instance
+
+:since: v1.0.0
+        """
+
+        self.output_info("Estimating schema changes (dry-run) ...")
+
+        for table in Abstract().metadata.sorted_tables:
+            if (not connection.get_bind(clause = table).has_table(table.name)): self.output_info("Table '{0}' will be created".format(table.name))
+        #
+
+        instance_classes = [ ]
+        db_classes = Abstract.__subclasses__()
+
+        while (len(db_classes) > 0):
+            db_class = db_classes.pop()
+            db_classes.extend(db_class.__subclasses__())
+
+            if (db_class.db_schema_version is not None and hasattr(db_class, "__table__")): instance_classes.append(db_class)
+        #
+
+        schema_class = NamedClassLoader.get_class("pas_database.Schema")
+
+        for schema_plan in schema_class.get_upgrade_plan(instance_classes):
+            if (schema_plan['current_version'] < 1):
+                self.output_info("Schema '{0}' will be recorded at version {1:d}".format(schema_plan['name'], schema_plan['target_version']))
+            elif (schema_plan['current_version'] < schema_plan['target_version']):
+                self.output_info("Schema '{0}' will be upgraded from version {1:d} to {2:d}".format(schema_plan['name'],
+                                                                                                     schema_plan['current_version'],
+                                                                                                     schema_plan['target_version']
+                                                                                                    ))
+
+                for version_plan in schema_plan['versions']:
+                    self.output_info("  Version {0:d} ({1}): {2:d} statements".format(version_plan['version'],
+                                                                                   version_plan['file'],
+                                                                                   len(version_plan['statements'])
+                                                                                  ))
+
+                    for statement in version_plan['statements']:
+                        tables = ", ".join("{0} (~{1} rows)".format(table_name, ("?" if (rows is None) else rows))
+                                           for table_name, rows in sorted(statement['tables'].items())
+                                          )
+
+                        self.output_info("    {0}{1}{2}".format(statement['type'],
+                                                                ("" if (tables == "") else " " + tables),
+                                                                ("" if (statement['plan_rows'] is None) else "; estimated rows affected: {0:d}".format(statement['plan_rows']))
+                                                               ))
+                    #
+                #
+            #
+        #
+
+        self.output_info("Process completed (nothing applied)")
+    #
+
     def run_apply_schema(self, args):
         """
 Callback for execution.
@@ -154,15 +216,53 @@ Callback for execution.
         with Connection.get_instance() as connection:
             Hook.call("pas.Database.loadAll")
 
+            if (args.dry_run):
+                self._output_schema_plan(connection)
+                return
+            #
+
             self.output_info("Applying schema ...")
 
             with HookContext("pas.Database.applySchema"), TransactionContext():
-                Abstract().metadata.create_all(connection.get_bind())
+                metadata = Abstract().metadata
+                bind_tables = { }
+
+                for table in metadata.sorted_tables:
+                    bind = connection.get_bind(clause = table)
+
+                    if (bind not in bind_tables): bind_tables[bind] = [ ]
+                    bind_tables[bind].append(table)
+                #
+
+                for bind in bind_tables: metadata.create_all(bind, tables = bind_tables[bind])
             #
         #
 
         self.output_info("Process completed")
     #
+
+    def run_cleanup_key_store(self, args):
+        """
+Callback for execution.
+
+:since: v1.0.0
+        """
+
+        key_store_class = NamedClassLoader.get_class("pas_database.instances.KeyStore")
+
+        if (args.dry_run):
+            self.output_info("Counting expired KeyStore entries (dry-run) ...")
+            self.output_info("Process completed ({0:d} entries would be deleted)".format(key_store_class.get_expired_count()))
+
+            return
+        #
+
+        self.output_info("Deleting expired KeyStore entries ...")
+
+        deleted = key_store_class.delete_expired(Settings.get("pas_database_key_store_sweep_batch_size", 1000))
+
+        self.output_info("Process completed ({0:d} entries deleted)".format(deleted))
+    #
 #
 
 def main():
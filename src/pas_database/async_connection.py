@@ -0,0 +1,416 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;database
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;mpl2
+----------------------------------------------------------------------------
+#echo(pasDatabaseVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module
+
+from asyncio import Lock, current_task, wait_for
+from contextvars import ContextVar
+from functools import wraps
+from os import path
+from threading import Lock as ThreadLock
+
+from dpt_module_loader import NamedClassLoader
+from dpt_runtime.environment import Environment
+from dpt_runtime.io_exception import IOException
+from dpt_runtime.value_exception import ValueException
+from dpt_settings import Settings
+
+from .connection import Connection
+from .connection_statistics import ConnectionStatistics
+
+try: from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+except ImportError: AsyncSession = None
+
+class AsyncConnection(object):
+    """
+"AsyncConnection" is a proxy for a SQLAlchemy asyncio session. It provides
+the same context semantics as "Connection" for asyncio based applications.
+Each task uses its own session. Tasks created within a connection context
+enter a new one as an AsyncSession must not be used concurrently. If access
+is serialized these tasks can not enter a connection context before the one
+of the creating task has been exited.
+
+:author:     direct Netware Group et al.
+:copyright:  (C) direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: database
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;mpl2
+             Mozilla Public License, v. 2.0
+    """
+
+    # pylint: disable=unused-argument
+
+    __slots__ = [ "_log_handler" ]
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+    _instance = None
+    """
+AsyncConnection singleton
+    """
+    _instance_lock = ThreadLock()
+    """
+Thread safety lock
+    """
+    _local = ContextVar("pas_database_async_connection_local", default = None)
+    """
+Context local data handle
+    """
+    _sa_engine = None
+    """
+Configured SQLAlchemy asyncio engine instance
+    """
+    _serialized_lock = None
+    """
+asyncio lock to serialize access
+    """
+
+    def __init__(self):
+        """
+Constructor __init__(AsyncConnection)
+
+:since: v1.0.0
+        """
+
+        self._log_handler = NamedClassLoader.get_singleton("dpt_logging.LogHandler", False)
+        """
+The LogHandler is called whenever debug messages should be logged or errors
+happened.
+        """
+    #
+
+    async def __aenter__(self):
+        """
+python.org: Enter the runtime context related to this object.
+
+:since: v1.0.0
+        """
+
+        await self._enter_context()
+        return self
+    #
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """
+python.org: Exit the runtime context related to this object.
+
+:return: (bool) True to suppress exceptions
+:since:  v1.0.0
+        """
+
+        await self._exit_context(exc_type, exc_value, traceback)
+        return False
+    #
+
+    def __getattr__(self, name):
+        """
+python.org: Called when an attribute lookup has not found the attribute in
+the usual places (i.e. it is not an instance attribute nor is it found in the
+class tree for self).
+
+:param name: Attribute name
+
+:return: (mixed) Session attribute
+:since:  v1.0.0
+        """
+
+        return getattr(self.get_session(), name)
+    #
+
+    async def begin(self):
+        """
+sqlalchemy.org: Begin a transaction on this Session.
+
+:since: v1.0.0
+        """
+
+        local = self._get_local()
+
+        # SQLAlchemy starts the most outer transaction itself by default
+        if (local.transactions > 0): await local.sa_session.begin_nested()
+
+        local.transactions += 1
+        if (Connection.is_debug() and self._log_handler is not None): self._log_handler.debug("{0!r} transaction '{1:d}' started", self, local.transactions, context = "pas_database")
+    #
+
+    async def commit(self):
+        """
+sqlalchemy.org: Flush pending changes and commit the current transaction.
+
+:since: v1.0.0
+        """
+
+        local = self._get_local()
+
+        if (local.transactions > 1 and local.sa_session.in_nested_transaction()): await local.sa_session.get_nested_transaction().commit()
+        else: await local.sa_session.commit()
+
+        if (Connection.is_debug() and self._log_handler is not None): self._log_handler.debug("{0!r} transaction '{1:d}' committed", self, local.transactions, context = "pas_database")
+
+        if (local.transactions > 0): local.transactions -= 1
+    #
+
+    async def _enter_context(self):
+        """
+Enters the connection context.
+
+:since: v1.0.0
+        """
+
+        if (Connection.is_debug() and self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}._enter_context()- (#echo(__LINE__)#)", self, context = "pas_database")
+
+        local = AsyncConnection._get_task_local()
+
+        if (local is None):
+            is_serialized = Connection.is_serialized()
+            parent_local = AsyncConnection._local.get()
+
+            if (is_serialized and parent_local is not None and parent_local.context_depth > 0):
+                # Waiting for the lock held by the parent task would never succeed if it awaits this one
+                raise IOException("AsyncConnection access is serialized and can not be entered by a task created within an active connection context")
+            #
+
+            if (is_serialized):
+                await wait_for(AsyncConnection._serialized_lock.acquire(), Settings.get("pas_database_lock_timeout", 30))
+            #
+
+            try: local = _AsyncConnectionLocal(AsyncSession(AsyncConnection._sa_engine, expire_on_commit = False))
+            except Exception:
+                if (is_serialized): AsyncConnection._serialized_lock.release()
+                raise
+            #
+
+            AsyncConnection._local.set(local)
+        #
+
+        local.context_depth += 1
+    #
+
+    async def _exit_context(self, exc_type, exc_value, traceback):
+        """
+Exits the connection context.
+
+:since: v1.0.0
+        """
+
+        if (Connection.is_debug() and self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}._exit_context()- (#echo(__LINE__)#)", self, context = "pas_database")
+
+        local = self._get_local()
+        local.context_depth -= 1
+
+        if (local.context_depth < 1):
+            try:
+                if (local.transactions > 0 and self._log_handler is not None):
+                    self._log_handler.warning("{0!r} has active transactions ({1:d}) while exiting the connection context", self, local.transactions, context = "pas_database")
+                #
+
+                try:
+                    if (exc_type is None and exc_value is None and local.sa_session.is_active): await local.sa_session.commit()
+                    else: await local.sa_session.rollback()
+                finally:
+                    # Loaded values stay available for detached instances
+                    local.sa_session.expunge_all()
+                    await local.sa_session.close()
+                #
+            finally:
+                AsyncConnection._local.set(None)
+                if (Connection.is_serialized()): AsyncConnection._serialized_lock.release()
+            #
+        #
+    #
+
+    def _get_local(self):
+        """
+Returns the context local data of the active connection context.
+
+:return: (object) Context local data
+:since:  v1.0.0
+        """
+
+        _return = AsyncConnection._get_task_local()
+        if (_return is None): raise IOException("AsyncConnection was called without an active connection context")
+
+        return _return
+    #
+
+    def get_session(self):
+        """
+Returns the active SQLAlchemy asyncio session.
+
+:since: v1.0.0
+        """
+
+        return self._get_local().sa_session
+    #
+
+    def get_transaction_depth(self):
+        """
+Returns the current transaction depth.
+
+:since: v1.0.0
+        """
+
+        local = AsyncConnection._get_task_local()
+        return (0 if (local is None) else local.transactions)
+    #
+
+    async def rollback(self):
+        """
+sqlalchemy.org: Rollback the current transaction in progress.
+
+:since: v1.0.0
+        """
+
+        local = self._get_local()
+
+        if (local.transactions > 1 and local.sa_session.in_nested_transaction()): await local.sa_session.get_nested_transaction().rollback()
+        else: await local.sa_session.rollback()
+
+        if (Connection.is_debug() and self._log_handler is not None): self._log_handler.debug("{0!r} transaction '{1:d}' rolled back", self, local.transactions, context = "pas_database")
+
+        if (local.transactions > 0): local.transactions -= 1
+    #
+
+    @staticmethod
+    def get_instance():
+        """
+Get the AsyncConnection singleton.
+
+:return: (AsyncConnection) Object on success
+:since:  v1.0.0
+        """
+
+        if (AsyncConnection._instance is None):
+            with AsyncConnection._instance_lock:
+                # Thread safety
+                if (AsyncConnection._instance is None):
+                    if (AsyncSession is None): raise IOException("SQLAlchemy asyncio support is not available")
+
+                    Connection._ensure_settings()
+                    if (not Settings.is_defined("pas_database_async_url")): raise ValueException("Asynchronous database configuration missing")
+
+                    url = Settings.get("pas_database_async_url").replace("__path_base__", path.abspath(Environment.get_base_path()))
+                    prefix = "pas_database_async_sqlalchemy_"
+
+                    engine_settings = { key[len(prefix):]: value
+                                        for key, value in Settings.get_dict().items() if (key.startswith(prefix))
+                                      }
+
+                    AsyncConnection._sa_engine = create_async_engine(url, **engine_settings)
+                    ConnectionStatistics.register_engine(AsyncConnection._sa_engine.sync_engine)
+
+                    AsyncConnection._serialized_lock = Lock()
+
+                    AsyncConnection._instance = AsyncConnection()
+                #
+            #
+        #
+
+        return AsyncConnection._instance
+    #
+
+    @staticmethod
+    def _get_task_local():
+        """
+Returns the context local data of the active connection context entered by
+the current task. Data inherited from the context of a parent task is
+ignored.
+
+:return: (object) Context local data; None if not entered
+:since:  v1.0.0
+        """
+
+        _return = AsyncConnection._local.get()
+
+        if (_return is not None
+            and (_return.context_depth < 1 or _return.task is not current_task())
+           ): _return = None
+
+        return _return
+    #
+
+    @staticmethod
+    def wrap_callable(_callable):
+        """
+Wraps a coroutine function to be executed with an established database
+connection.
+
+:param _callable: Wrapped coroutine function
+
+:return: (object) Proxy coroutine function
+:since:  v1.0.0
+        """
+
+        @wraps(_callable)
+        async def proxymethod(*args, **kwargs):
+            async with AsyncConnection.get_instance(): return await _callable(*args, **kwargs)
+        #
+
+        return proxymethod
+    #
+#
+
+class _AsyncConnectionLocal(object):
+    """
+Context local data of an "AsyncConnection" context.
+
+:author:     direct Netware Group et al.
+:copyright:  (C) direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: database
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;mpl2
+             Mozilla Public License, v. 2.0
+    """
+
+    __slots__ = [ "context_depth", "sa_session", "task", "transactions" ]
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    def __init__(self, sa_session):
+        """
+Constructor __init__(_AsyncConnectionLocal)
+
+:param sa_session: SQLAlchemy asyncio session
+
+:since: v1.0.0
+        """
+
+        self.context_depth = 0
+        """
+Connection context depth
+        """
+        self.sa_session = sa_session
+        """
+SQLAlchemy asyncio session
+        """
+        self.task = current_task()
+        """
+asyncio task the connection context has been entered by
+        """
+        self.transactions = 0
+        """
+Transaction depth
+        """
+    #
+#
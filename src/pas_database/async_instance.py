@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;database
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;mpl2
+----------------------------------------------------------------------------
+#echo(pasDatabaseVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error,no-name-in-module
+
+try: from collections.abc import MutableMapping
+except ImportError: from collections import MutableMapping
+
+from dpt_module_loader import NamedClassLoader
+from dpt_runtime.io_exception import IOException
+from dpt_runtime.value_exception import ValueException
+
+from sqlalchemy.inspection import inspect
+
+from .async_connection import AsyncConnection
+from .async_instance_iterator import AsyncInstanceIterator
+from .connection import Connection
+from .instance import Instance
+from .nothing_matched_exception import NothingMatchedException
+
+class AsyncInstance(MutableMapping):
+    """
+"AsyncInstance" is an abstract object encapsulating an SQLAlchemy database
+instance for asyncio based applications. Database operations are coroutines
+while data attributes are accessed without I/O.
+
+:author:     direct Netware Group et al.
+:copyright:  (C) direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: database
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;mpl2
+             Mozilla Public License, v. 2.0
+    """
+
+    # pylint: disable=unused-argument
+
+    _DB_INSTANCE_CLASS = None
+    """
+SQLAlchemy database instance class to initialize for new instances.
+    """
+
+    __slots__ = [ "__weakref__", "_db_instance", "_log_handler" ]
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    def __init__(self, db_instance = None):
+        """
+Constructor __init__(AsyncInstance)
+
+:param db_instance: Encapsulated SQLAlchemy database instance
+
+:since: v1.0.0
+        """
+
+        MutableMapping.__init__(self)
+
+        Instance._ensure_db_class(self.__class__, db_instance)
+
+        if (db_instance is None):
+            db_class = Instance.get_db_class(self.__class__)
+            if (db_class is not None): db_instance = db_class()
+        #
+
+        self._db_instance = db_instance
+        """
+Encapsulated SQLAlchemy database instance
+        """
+        self._log_handler = NamedClassLoader.get_singleton("dpt_logging.LogHandler", False)
+        """
+The LogHandler is called whenever debug messages should be logged or errors
+happened.
+        """
+    #
+
+    def __delitem__(self, key):
+        """
+python.org: Called to implement deletion of self[key].
+
+:param key: Database instance attribute
+
+:since: v1.0.0
+        """
+
+        raise IOException("Database instance attributes can not be deleted")
+    #
+
+    def __getitem__(self, key):
+        """
+python.org: Called to implement evaluation of self[key].
+
+:param key: Database instance to access
+
+:return: (mixed) Database attribute value
+:since:  v1.0.0
+        """
+
+        return self._get_data_attribute(key)
+    #
+
+    def __iter__(self):
+        """
+python.org: Return an iterator object.
+
+:return: (object) Iterator object
+:since:  v1.0.0
+        """
+
+        db_instance_class = Instance.get_db_class(self.__class__)
+        if (db_instance_class is None): raise IOException("Database instance attributes can not be accessed")
+
+        for column in db_instance_class.__table__.columns: yield column.key
+    #
+
+    def __len__(self):
+        """
+python.org: Called to implement the built-in function len().
+
+:return: (int) Number of database instance attributes
+:since: v1.0.0
+        """
+
+        return len(Instance.get_db_class(self.__class__).__table__.columns)
+    #
+
+    def __setitem__(self, key, value):
+        """
+python.org: Called to implement assignment to self[key].
+
+:param key: Database instance attribute
+:param value: Database instance attribute value
+
+:since: v1.0.0
+        """
+
+        self._set_data_attribute(key, value)
+    #
+
+    @property
+    def is_known(self):
+        """
+Returns true if the instance is already saved in the database.
+
+:return: (bool) True if known
+:since:  v1.0.0
+        """
+
+        return (self._db_instance is not None and inspect(self._db_instance).has_identity)
+    #
+
+    async def delete(self):
+        """
+Deletes this entry from the database.
+
+:return: (bool) True on success
+:since:  v1.0.0
+        """
+
+        if (Connection.is_debug() and self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}.delete()- (#echo(__LINE__)#)", self, context = "pas_database")
+        _return = True
+
+        if (self.is_known):
+            async with AsyncConnection.get_instance() as connection:
+                await self._ensure_attached_instance(connection)
+
+                await connection.delete(self._db_instance)
+                await connection.flush()
+            #
+
+            self._db_instance = None
+        else: _return = False
+
+        return _return
+    #
+
+    async def _ensure_attached_instance(self, connection):
+        """
+Checks the SQLAlchemy database instance to be attached to the session of
+the given connection.
+
+:param connection: AsyncConnection instance
+
+:since: v1.0.0
+        """
+
+        instance_state = inspect(self._db_instance)
+
+        if (instance_state.detached and instance_state.has_identity):
+            self._db_instance = await connection.merge(self._db_instance)
+        elif (instance_state.transient): connection.add(self._db_instance)
+    #
+
+    def _get_data_attribute(self, attribute):
+        """
+Returns the data for the requested attribute.
+
+:param attribute: Requested attribute
+
+:return: (mixed) Value for the requested attribute; None if undefined
+:since:  v1.0.0
+        """
+
+        return getattr(self._db_instance, attribute, None)
+    #
+
+    def get_data_attributes(self, *args):
+        """
+Returns the requested attributes.
+
+:return: (dict) Values for the requested attributes; None for undefined ones
+:since:  v1.0.0
+        """
+
+        return { attribute: self._get_data_attribute(attribute) for attribute in args }
+    #
+
+    async def reload(self):
+        """
+Reload instance data from the database.
+
+:since: v1.0.0
+        """
+
+        if (self._db_instance is None or (not self.is_known)): raise IOException("Database instance is not reloadable.")
+
+        async with AsyncConnection.get_instance() as connection:
+            await self._ensure_attached_instance(connection)
+            await connection.refresh(self._db_instance)
+        #
+    #
+
+    async def save(self):
+        """
+Saves changes of the instance into the database.
+
+:since: v1.0.0
+        """
+
+        if (Connection.is_debug() and self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}.save()- (#echo(__LINE__)#)", self, context = "pas_database")
+
+        async with AsyncConnection.get_instance() as connection:
+            await self._ensure_attached_instance(connection)
+            await connection.flush()
+        #
+    #
+
+    def _set_data_attribute(self, attribute, value):
+        """
+Sets data for the requested attribute.
+
+:param attribute: Requested attribute
+:param value: Value for the requested attribute
+
+:since: v1.0.0
+        """
+
+        if (hasattr(self._db_instance, attribute)): setattr(self._db_instance, attribute, value)
+        else: raise ValueException("Attribute '{0}' is not defined on database instance".format(attribute))
+    #
+
+    def set_data_attributes(self, **kwargs):
+        """
+Sets values given as keyword arguments to this method.
+
+:since: v1.0.0
+        """
+
+        for key in kwargs: self._set_data_attribute(key, kwargs[key])
+    #
+
+    @classmethod
+    async def iterator(cls, statement, *args, **kwargs):
+        """
+Returns an instance wrapping asynchronous iterator streaming the results of
+the given statement. It has to be consumed within an active connection
+context.
+
+:param cls: Encapsulating asynchronous database instance class
+:param statement: SQLAlchemy select statement
+
+:return: (object) AsyncInstanceIterator object
+:since:  v1.0.0
+        """
+
+        result = await AsyncConnection.get_instance().stream(statement)
+        return AsyncInstanceIterator(result.scalars(), cls, *args, **kwargs)
+    #
+
+    @classmethod
+    async def load_id(cls, _id):
+        """
+Load the database entry by its primary key.
+
+:param cls: Expected encapsulating database instance class
+:param _id: Primary key
+
+:return: (object) AsyncInstance on success
+:since:  v1.0.0
+        """
+
+        db_class = Instance.get_db_class(cls)
+        if (db_class is None): raise ValueException("Encapsulating database class is not valid")
+
+        async with AsyncConnection.get_instance() as connection: db_instance = await connection.get(db_class, _id)
+
+        if (db_instance is None): raise NothingMatchedException("Database ID '{0}' not found".format(_id))
+        return cls(db_instance)
+    #
+#
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;database
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;mpl2
+----------------------------------------------------------------------------
+#echo(pasDatabaseVersion)#
+#echo(__FILEPATH__)#
+"""
+
+class AsyncInstanceIterator(object):
+    """
+"AsyncInstanceIterator" provides an instance wrapping asynchronous iterator
+to encapsulate SQLAlchemy database instances streamed by an asyncio session
+with an given class.
+
+:author:     direct Netware Group et al.
+:copyright:  (C) direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: database
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;mpl2
+             Mozilla Public License, v. 2.0
+    """
+
+    __slots__ = [ "args", "instance_class", "kwargs", "result" ]
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    def __init__(self, result, instance_class = None, *args, **kwargs):
+        """
+Constructor __init__(AsyncInstanceIterator)
+
+:param result: SQLAlchemy asyncio scalar result
+:param instance_class: Encapsulating asynchronous database instance class
+
+:since: v1.0.0
+        """
+
+        self.args = args
+        """
+Arguments given to the contructor of the encapsulating database instance
+        """
+        self.instance_class = instance_class
+        """
+Instance class encapsulating the database instance
+        """
+        self.kwargs = kwargs
+        """
+Keyword arguments given to the contructor of the encapsulating database
+instance
+        """
+        self.result = result
+        """
+Results being interated
+        """
+    #
+
+    def __aiter__(self):
+        """
+python.org: Return an asynchronous iterator object.
+
+:return: (object) Iterator object
+:since:  v1.0.0
+        """
+
+        return self
+    #
+
+    async def __anext__(self):
+        """
+python.org: Return an awaitable resulting in the next value of the
+iterator.
+
+:return: (object) Result object
+:since:  v1.0.0
+        """
+
+        db_instance = await self.result.__anext__()
+
+        return (db_instance
+                if (self.instance_class is None) else
+                self.instance_class(db_instance, *self.args, **self.kwargs)
+               )
+    #
+#
@@ -17,10 +17,18 @@ https://www.direct-netware.de/redirect?licenses;mpl2
 #echo(__FILEPATH__)#
 """
 
+from itertools import count
+
 from dpt_runtime.type_exception import TypeException
 from dpt_runtime.value_exception import ValueException
+from dpt_settings import Settings
+from dpt_threading.thread_lock import ThreadLock
+
+from sqlalchemy.sql.elements import BindParameter
+from sqlalchemy.sql.expression import and_, bindparam, or_
+from sqlalchemy.sql.visitors import replacement_traverse
 
-from sqlalchemy.sql.expression import and_, or_
+from .lru_cache import LruCache
 
 class ConditionDefinition(object):
     """
@@ -103,6 +111,14 @@ Condition contains a sub condition definition.
 python.org: __slots__ reserves space for the declared variables and prevents
 the automatic creation of __dict__ and __weakref__ for each instance.
     """
+    _clause_cache = None
+    """
+LRU cache of parameterized condition clauses by shape
+    """
+    _clause_cache_lock = ThreadLock()
+    """
+Thread safety lock
+    """
 
     def __init__(self, concatenation = OR):
         """
@@ -398,7 +414,9 @@ Applies the conditions to the given SQLAlchemy query instance.
 :since:  v1.0.0
         """
 
-        conditions = self._get_conditions(db_column_definition)
+        conditions, values = self.compile(db_column_definition)
+
+        if (conditions is not None and len(values) > 0): conditions = ConditionDefinition._get_bound_conditions(conditions, values)
 
         return (query
                 if (conditions is None) else
@@ -416,6 +434,34 @@ Clears the current condition list.
         self._conditions = [ ]
     #
 
+    def compile(self, db_column_definition):
+        """
+Returns the parameterized SQLalchemy condition clause corresponding to the
+structure of this definition instance and the values to be bound. Clauses
+are cached by structure and database class or column definition. Bind
+parameter names are only unique within the clause returned.
+
+:param db_column_definition: Database class or column definition
+
+:return: (tuple) SQLalchemy condition clause (None if empty) and dict of
+         bind parameter values
+:since:  v1.0.0
+        """
+
+        shape, shape_values = self._get_shape()
+        cache_key = ( db_column_definition, shape )
+
+        clause_cache = ConditionDefinition._get_clause_cache()
+        _return = clause_cache.get(cache_key)
+
+        if (_return is None):
+            _return = ConditionDefinition._get_parameterized_conditions(db_column_definition, shape, count())
+            clause_cache.set(cache_key, _return)
+        #
+
+        return ( _return, { "pas_condition_{0:d}".format(position): value for position, value in enumerate(shape_values) } )
+    #
+
     def _get_condition(self, db_column_definition, condition):
         """
 Returns a SQLalchemy condition.
@@ -435,35 +481,44 @@ Returns a SQLalchemy condition.
             _return = condition['condition_definition']._get_conditions(db_column_definition)
         else:
             column = ConditionDefinition._get_db_column(db_column_definition, condition['attribute'])
+            _return = ConditionDefinition._get_condition_clause(column, condition['type'], condition['value'])
+        #
+
+        return _return
+    #
+
+    def _get_shape(self):
+        """
+Returns the structure of this definition instance without values and the
+list of values in the order of their occurrence.
+
+:return: (tuple) Hashable structure and list of values
+:since:  v1.0.0
+        """
+
+        # pylint: disable=protected-access
+
+        shape = [ ]
+        values = [ ]
 
-            if (condition['type'] == ConditionDefinition.TYPE_CASE_INSENSITIVE_MATCH):
-                _return = column.ilike(condition['value'], "\\")
-            elif (condition['type'] == ConditionDefinition.TYPE_CASE_INSENSITIVE_NO_MATCH):
-                _return = column.notilike(condition['value'], "\\")
-            elif (condition['type'] == ConditionDefinition.TYPE_CASE_SENSITIVE_MATCH):
-                _return = column.like(condition['value'], "\\")
-            elif (condition['type'] == ConditionDefinition.TYPE_CASE_SENSITIVE_NO_MATCH):
-                _return = column.notlike(condition['value'], "\\")
-            elif (condition['type'] == ConditionDefinition.TYPE_EXACT_MATCH):
-                _return = (column == condition['value'])
-            elif (condition['type'] == ConditionDefinition.TYPE_EXACT_NO_MATCH):
-                _return = (column != condition['value'])
-            elif (condition['type'] == ConditionDefinition.TYPE_GREATER_THAN_MATCH):
-                _return = (column > condition['value'])
-            elif (condition['type'] == ConditionDefinition.TYPE_GREATER_THAN_OR_EQUAL_MATCH):
-                _return = (column >= condition['value'])
-            elif (condition['type'] == ConditionDefinition.TYPE_IN_LIST_MATCH):
-                _return = column.in_(condition['value'])
-            elif (condition['type'] == ConditionDefinition.TYPE_LESS_THAN_MATCH):
-                _return = (column < condition['value'])
-            elif (condition['type'] == ConditionDefinition.TYPE_LESS_THAN_OR_EQUAL_MATCH):
-                _return = (column <= condition['value'])
-            elif (condition['type'] == ConditionDefinition.TYPE_NOT_IN_LIST_MATCH):
-                _return = column.notin_(condition['value'])
+        for condition in self._conditions:
+            if (condition['type'] == ConditionDefinition.TYPE_SUB_CONDITION):
+                sub_shape, sub_values = condition['condition_definition']._get_shape()
+
+                shape.append(( condition['type'], sub_shape ))
+                values.extend(sub_values)
+            elif (condition['value'] is None
+                  and condition['type'] in ( ConditionDefinition.TYPE_EXACT_MATCH, ConditionDefinition.TYPE_EXACT_NO_MATCH )
+                 ):
+                # "IS NULL" and "IS NOT NULL" can not be parameterized
+                shape.append(( condition['type'], condition['attribute'], None ))
+            else:
+                shape.append(( condition['type'], condition['attribute'] ))
+                values.append(condition['value'])
             #
         #
 
-        return _return
+        return ( ( self.concatenation, tuple(shape) ), values )
     #
 
     def _get_conditions(self, db_column_definition):
@@ -499,6 +554,116 @@ instance.
         return _return
     #
 
+    @staticmethod
+    def _get_bound_conditions(conditions, values):
+        """
+Returns a copy of the given parameterized condition clause with the values
+bound to unique parameters. Clauses of multiple definitions applied to the
+same query can not collide this way.
+
+:param conditions: Parameterized SQLalchemy condition clause
+:param values: Dict of bind parameter values
+
+:return: (object) SQLalchemy condition clause
+:since:  v1.0.0
+        """
+
+        def replace(element):
+            """
+Returns a unique bind parameter with its value for the given one.
+
+:param element: SQLalchemy clause element
+
+:return: (object) Replacement; None to keep the element
+:since:  v1.0.0
+            """
+
+            return (bindparam(element.key, values[element.key], type_ = element.type, unique = True, expanding = element.expanding)
+                    if (isinstance(element, BindParameter) and element.key in values) else
+                    None
+                   )
+        #
+
+        return replacement_traverse(conditions, { }, replace)
+    #
+
+    @staticmethod
+    def _get_clause_cache():
+        """
+Returns the LRU cache of parameterized condition clauses.
+
+:return: (object) LruCache instance
+:since:  v1.0.0
+        """
+
+        if (ConditionDefinition._clause_cache is None):
+            with ConditionDefinition._clause_cache_lock:
+                # Thread safety
+                if (ConditionDefinition._clause_cache is None):
+                    ConditionDefinition._clause_cache = LruCache(Settings.get("pas_database_condition_cache_size", 512))
+                #
+            #
+        #
+
+        return ConditionDefinition._clause_cache
+    #
+
+    @staticmethod
+    def get_cache_statistics():
+        """
+Returns the statistics of the parameterized condition clause cache.
+
+:return: (dict) Cache statistics
+:since:  v1.0.0
+        """
+
+        return ConditionDefinition._get_clause_cache().statistics
+    #
+
+    @staticmethod
+    def _get_condition_clause(column, condition_type, value):
+        """
+Returns a SQLalchemy condition for the given column, type and value.
+
+:param column: Database instance column
+:param condition_type: Condition type
+:param value: Condition value or bind parameter
+
+:return: (object) SQLalchemy condition; None if unknown type
+:since:  v1.0.0
+        """
+
+        _return = None
+
+        if (condition_type == ConditionDefinition.TYPE_CASE_INSENSITIVE_MATCH):
+            _return = column.ilike(value, "\\")
+        elif (condition_type == ConditionDefinition.TYPE_CASE_INSENSITIVE_NO_MATCH):
+            _return = column.notilike(value, "\\")
+        elif (condition_type == ConditionDefinition.TYPE_CASE_SENSITIVE_MATCH):
+            _return = column.like(value, "\\")
+        elif (condition_type == ConditionDefinition.TYPE_CASE_SENSITIVE_NO_MATCH):
+            _return = column.notlike(value, "\\")
+        elif (condition_type == ConditionDefinition.TYPE_EXACT_MATCH):
+            _return = (column == value)
+        elif (condition_type == ConditionDefinition.TYPE_EXACT_NO_MATCH):
+            _return = (column != value)
+        elif (condition_type == ConditionDefinition.TYPE_GREATER_THAN_MATCH):
+            _return = (column > value)
+        elif (condition_type == ConditionDefinition.TYPE_GREATER_THAN_OR_EQUAL_MATCH):
+            _return = (column >= value)
+        elif (condition_type == ConditionDefinition.TYPE_IN_LIST_MATCH):
+            _return = column.in_(value)
+        elif (condition_type == ConditionDefinition.TYPE_LESS_THAN_MATCH):
+            _return = (column < value)
+        elif (condition_type == ConditionDefinition.TYPE_LESS_THAN_OR_EQUAL_MATCH):
+            _return = (column <= value)
+        elif (condition_type == ConditionDefinition.TYPE_NOT_IN_LIST_MATCH):
+            _return = column.notin_(value)
+        #
+
+        return _return
+    #
+
     @staticmethod
     def _get_db_column(db_column_definition, name):
         """
@@ -516,4 +681,59 @@ Returns a column from the given definition.
                 getattr(db_column_definition, name)
                )
     #
+
+    @staticmethod
+    def _get_parameterized_conditions(db_column_definition, shape, positions):
+        """
+Returns the SQLalchemy condition clause for the given structure with bind
+parameters instead of values.
+
+:param db_column_definition: Database class or column definition
+:param shape: Structure returned by "_get_shape()"
+:param positions: Counter used to name bind parameters in the order of
+                  their values
+
+:return: (object) SQLalchemy condition clause; None if empty
+:since:  v1.0.0
+        """
+
+        _return = None
+
+        concatenation, conditions = shape
+        condition_clauses = [ ]
+
+        for condition in conditions:
+            if (condition[0] == ConditionDefinition.TYPE_SUB_CONDITION):
+                condition_clause = ConditionDefinition._get_parameterized_conditions(db_column_definition, condition[1], positions)
+            else:
+                column = ConditionDefinition._get_db_column(db_column_definition, condition[1])
+
+                if (len(condition) > 2): value = None
+                else:
+                    value = bindparam("pas_condition_{0:d}".format(next(positions)),
+                                      expanding = (condition[0] in ( ConditionDefinition.TYPE_IN_LIST_MATCH,
+                                                                     ConditionDefinition.TYPE_NOT_IN_LIST_MATCH
+                                                                   )
+                                                  )
+                                     )
+                #
+
+                condition_clause = ConditionDefinition._get_condition_clause(column, condition[0], value)
+            #
+
+            if (condition_clause is not None): condition_clauses.append(condition_clause)
+        #
+
+        condition_clauses_count = len(condition_clauses)
+
+        if (condition_clauses_count == 1): _return = condition_clauses[0]
+        elif (condition_clauses_count > 1):
+            _return = (and_(*condition_clauses)
+                       if (concatenation == ConditionDefinition.AND) else
+                       or_(*condition_clauses)
+                      )
+        #
+
+        return _return
+    #
 #
@@ -23,6 +23,7 @@ from functools import wraps
 from os import path
 from random import randrange
 from threading import current_thread, local
+from time import perf_counter
 from weakref import ref
 
 try: from urllib.parse import urlsplit
@@ -36,9 +37,13 @@ from dpt_settings import Settings
 from dpt_threading.instance_lock import InstanceLock
 from dpt_threading.thread_lock import ThreadLock
 
+from sqlalchemy import event
 from sqlalchemy.engine import engine_from_config
 from sqlalchemy.orm.session import Session
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import NullPool, StaticPool
+
+from .connection_statistics import ConnectionStatistics
+from .fair_lock import FairLock
 
 class Connection(object):
     """
@@ -59,14 +64,34 @@ class Connection(object):
     """
 python.org: __slots__ reserves space for the declared variables and prevents
 the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+    _debug = False
+    """
+True if debug messages of connection contexts and instances are logged
     """
     _instance_lock = InstanceLock()
     """
 Thread safety lock
+    """
+    _sa_binds = None
+    """
+SQLAlchemy session binds of ORM classes routed to named engines
     """
     _sa_engine = None
     """
 Configured SQLAlchemy engine instance
+    """
+    _sa_engine_generation = 0
+    """
+Counter incremented if pooled database connections have been invalidated
+    """
+    _sa_engine_routing = { }
+    """
+ORM class name to named engine routing map
+    """
+    _sa_engines = { }
+    """
+Configured named SQLAlchemy engine instances
     """
     _settings_initialized = False
     """
@@ -75,10 +100,23 @@ True after the database settings have been read from file
     _serialized = True
     """
 Serialize access to the underlying database if true
+    """
+    _serialized_pooled = False
+    """
+Keep one pre-warmed database connection for serialized access if true
+    """
+    _session_reuse = False
+    """
+Keep the session and its database connection of each thread between most
+outer contexts if true
     """
     _serialized_lock = ThreadLock()
     """
 Thread safety lock
+    """
+    _threaded_debug = False
+    """
+True if thread related debug messages of connection contexts are logged
     """
     _weakref_instance = None
     """
@@ -106,12 +144,18 @@ happened.
             with Connection._instance_lock:
                 # Thread safety
                 if (Connection._sa_engine is None):
-                    connection_settings = Settings.get_dict()
-                    if (Connection._serialized): connection_settings['pas_database_sqlalchemy_poolclass'] = NullPool
+                    base_path = path.abspath(Environment.get_base_path())
+
+                    for engine_name, engine_settings in Settings.get("pas_database_engines", { }).items():
+                        if ("url" not in engine_settings): raise ValueException("Database engine '{0}' configuration is missing an URL".format(engine_name))
+
+                        engine_settings = engine_settings.copy()
+                        engine_settings['url'] = engine_settings['url'].replace("__path_base__", base_path)
+
+                        Connection._sa_engines[engine_name] = Connection._create_engine(engine_settings)
+                    #
 
-                    Connection._sa_engine = engine_from_config(connection_settings,
-                                                               prefix = "pas_database_sqlalchemy_"
-                                                              )
+                    Connection._sa_engine = Connection._create_engine(Settings.get_dict(), "pas_database_sqlalchemy_")
                 #
             #
         #
@@ -133,9 +177,12 @@ Destructor __del__(Connection)
                 if (len(self.local.sa_session.new) > 0): self._log_handler.warning("{0!r} has new instances to be ignored", self, context = "pas_database")
             #
 
-            self.local.sa_session.expunge_all()
-            self.local.sa_session.close()
+            Connection._close_session(self.local.sa_session)
         #
+
+        if (self.local is not None
+            and getattr(self.local, "sa_idle_session", None) is not None
+           ): Connection._close_session(self.local.sa_idle_session)
     #
 
     def __enter__(self):
@@ -198,7 +245,7 @@ sqlalchemy.org: Begin a transaction on this Session.
         #
 
         self.local.transactions += 1
-        if (self._log_handler is not None): self._log_handler.debug("{0!r} transaction '{1:d}' started", self, self.local.transactions, context = "pas_database")
+        if (Connection._debug and self._log_handler is not None): self._log_handler.debug("{0!r} transaction '{1:d}' started", self, self.local.transactions, context = "pas_database")
     #
 
     def commit(self):
@@ -211,7 +258,7 @@ sqlalchemy.org: Flush pending changes and commit the current transaction.
         self._ensure_thread_local_session()
 
         self.local.sa_session.commit()
-        if (self._log_handler is not None): self._log_handler.debug("{0!r} transaction '{1:d}' committed", self, self.local.transactions, context = "pas_database")
+        if (Connection._debug and self._log_handler is not None): self._log_handler.debug("{0!r} transaction '{1:d}' committed", self, self.local.transactions, context = "pas_database")
 
         if (self.local.transactions > 0): self.local.transactions -= 1
     #
@@ -228,7 +275,10 @@ sure that these variables are defined.
 
         if (not hasattr(self.local, "context_depth")):
             self.local.context_depth = 0
+            self.local.read_only = False
+            self.local.sa_idle_session = None
             self.local.sa_session = None
+            self.local.sa_session_read_only = False
             self.local.transactions = 0
         #
     #
@@ -244,39 +294,66 @@ the last context is exited.
         self._ensure_thread_local()
 
         if (self.local.sa_session is not None):
-            sa_connection = (self.local.sa_session.connection() if (self.local.sa_session.is_active) else None)
-
-            if (sa_connection is None
-                or sa_connection.closed
-                or sa_connection.invalidated
-               ):
-                self.local.sa_session.expunge_all()
-                self.local.sa_session.close()
+            if (Connection._session_reuse):
+                # Liveness is tracked with pool events instead of checking out a connection
+                sa_connection = self.local.sa_session.info.get("pas_database_connection")
+
+                is_session_valid = (self.local.sa_session.info.get("pas_database_engine_generation") == Connection._sa_engine_generation
+                                    and (sa_connection is None or ((not sa_connection.closed) and (not sa_connection.invalidated)))
+                                   )
+            else:
+                sa_connection = (self.local.sa_session.connection() if (self.local.sa_session.is_active) else None)
+                is_session_valid = (sa_connection is not None and (not sa_connection.closed) and (not sa_connection.invalidated))
+            #
 
+            if (not is_session_valid):
+                Connection._close_session(self.local.sa_session)
                 self.local.sa_session = None
             #
         #
 
-        if (self.local.sa_session is None): self.local.sa_session = Session(Connection._sa_engine)
+        if (self.local.sa_session is None):
+            if (self.local.read_only): self.local.sa_session = Connection._get_read_only_session()
+            elif (Connection._session_reuse):
+                # Keep the connection checked out for this thread between contexts
+                sa_connection = Connection._sa_engine.connect()
+
+                self.local.sa_session = Session(sa_connection, binds = Connection._get_session_binds())
+                self.local.sa_session.info['pas_database_connection'] = sa_connection
+            else: self.local.sa_session = Session(Connection._sa_engine, binds = Connection._get_session_binds())
+
+            self.local.sa_session.info['pas_database_engine_generation'] = Connection._sa_engine_generation
+        #
     #
 
-    def _enter_context(self):
+    def _enter_context(self, read_only = False):
         """
 Enters the connection context.
 
+:param read_only: True to use the read-only session if this is the most
+                  outer context
+
 :since: v1.0.0
         """
 
-        if (self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}._enter_context()- (#echo(__LINE__)#)", self, context = "pas_database")
+        if (Connection._debug and self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}._enter_context()- (#echo(__LINE__)#)", self, context = "pas_database")
 
         self._ensure_thread_local()
 
         if (self.local.context_depth < 1):
-            if (Connection.is_serialized()): Connection._serialized_lock.acquire()
+            if (ConnectionStatistics.is_enabled()): ConnectionStatistics.begin_context()
+
+            if (Connection.is_serialized()): Connection._acquire_serialized_lock()
+
+            if (self.local.sa_session_read_only != read_only):
+                # Swap the primary and read-only sessions kept for this thread
+                self.local.sa_session, self.local.sa_idle_session = self.local.sa_idle_session, self.local.sa_session
+                self.local.sa_session_read_only = read_only
+            #
 
-            if (self._log_handler is not None
-                and Settings.get("pas_database_threaded_debug", False)
-               ): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}._enter_context()- reporting: Connection acquired for thread ID {1:d}", self, current_thread().ident, context = "pas_database")
+            self.local.read_only = read_only
+
+            if (Connection._threaded_debug and self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}._enter_context()- reporting: Connection acquired for thread ID {1:d}", self, current_thread().ident, context = "pas_database")
         #
 
         try:
@@ -285,7 +362,7 @@ Enters the connection context.
         except Exception:
             if (self.local.context_depth < 1
                 and Connection.is_serialized()
-               ): Connection._serialized_lock.release()
+               ): Connection._release_serialized_lock()
 
             raise
         #
@@ -317,7 +394,7 @@ Exits the connection context.
 :since: v1.0.0
         """
 
-        if (self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}._exit_context()- (#echo(__LINE__)#)", self, context = "pas_database")
+        if (Connection._debug and self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}._exit_context()- (#echo(__LINE__)#)", self, context = "pas_database")
 
         self.local.context_depth -= 1
 
@@ -327,23 +404,56 @@ Exits the connection context.
                     self._log_handler.warning("{0!r} has active transactions ({1:d}) while exiting the connection context", self, self.local.transactions, context = "pas_database")
                 #
 
+                is_read_only_modified = False
+
                 if (self.local.sa_session is not None):
-                    if (exc_type is None and exc_value is None and self.local.sa_session.is_active): self.local.sa_session.commit()
+                    if (self.local.read_only):
+                        sa_session = self.local.sa_session
+                        is_read_only_modified = (len(sa_session.new) + len(sa_session.dirty) + len(sa_session.deleted) > 0)
+
+                        # Detach instances before ending the transaction to keep loaded values
+                        sa_session.expunge_all()
+                        sa_session.rollback()
+                    elif (exc_type is None and exc_value is None and self.local.sa_session.is_active): self.local.sa_session.commit()
                     else: self.local.sa_session.rollback()
                 #
 
                 self.local.transactions = 0
 
-                if (self._log_handler is not None
-                    and Settings.get("pas_database_threaded_debug", False)
-                   ): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}._exit_context()- reporting: Cleared session instances for thread ID {1:d}", self, current_thread().ident, context = "pas_database")
+                if (self.local.read_only):
+                    # Swap the primary session back for connection contexts entered afterwards
+                    self.local.sa_session, self.local.sa_idle_session = self.local.sa_idle_session, self.local.sa_session
+                    self.local.sa_session_read_only = False
+                    self.local.read_only = False
+
+                    if (is_read_only_modified and exc_type is None and exc_value is None):
+                        raise ValueException("Changes made in a read-only connection context can not be written")
+                    #
+                #
+
+                if (Connection._threaded_debug and self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}._exit_context()- reporting: Cleared session instances for thread ID {1:d}", self, current_thread().ident, context = "pas_database")
             #
         #
         finally:
-            if (Connection.is_serialized() and self.local.context_depth < 1): Connection._serialized_lock.release()
+            if (self.local.context_depth < 1):
+                if (ConnectionStatistics.is_enabled()): ConnectionStatistics.end_context()
+                if (Connection.is_serialized()): Connection._release_serialized_lock()
+            #
         #
     #
 
+    def get_context_depth(self):
+        """
+Returns the connection context depth of the current thread.
+
+:return: (int) Connection context depth
+:since:  v1.0.0
+        """
+
+        self._ensure_thread_local()
+        return self.local.context_depth
+    #
+
     def get_session(self):
         """
 Returns the active SQLAlchemy session.
@@ -366,6 +476,18 @@ Returns the current transaction depth.
         return self.local.transactions
     #
 
+    def is_read_only(self):
+        """
+Returns true if the active connection context uses the read-only session.
+
+:return: (bool) True if read-only
+:since:  v1.0.0
+        """
+
+        self._ensure_thread_local()
+        return self.local.read_only
+    #
+
     def optimize(self, table):
         """
 Optimizes the given database table.
@@ -405,11 +527,90 @@ sqlalchemy.org: Rollback the current transaction in progress.
         #
 
         self.local.sa_session.rollback()
-        if (self._log_handler is not None): self._log_handler.debug("{0!r} transaction '{1:d}' rolled back", self, self.local.transactions, context = "pas_database")
+        if (Connection._debug and self._log_handler is not None): self._log_handler.debug("{0!r} transaction '{1:d}' rolled back", self, self.local.transactions, context = "pas_database")
 
         if (self.local.transactions > 0): self.local.transactions -= 1
     #
 
+    @staticmethod
+    def _acquire_serialized_lock():
+        """
+Acquires the lock serializing access to the underlying database.
+
+:since: v1.0.0
+        """
+
+        if (ConnectionStatistics.is_enabled()):
+            ConnectionStatistics.begin_lock_wait()
+            lock_wait_started = perf_counter()
+
+            try: Connection._serialized_lock.acquire()
+            except Exception:
+                ConnectionStatistics.end_lock_wait(perf_counter() - lock_wait_started, False)
+                raise
+            #
+
+            ConnectionStatistics.end_lock_wait(perf_counter() - lock_wait_started)
+        else: Connection._serialized_lock.acquire()
+    #
+
+    @staticmethod
+    def _close_session(sa_session):
+        """
+Closes the given SQLAlchemy session and the database connection kept for
+it.
+
+:param sa_session: SQLAlchemy session
+
+:since: v1.0.0
+        """
+
+        sa_connection = sa_session.info.get("pas_database_connection")
+
+        sa_session.expunge_all()
+        sa_session.close()
+
+        if (sa_connection is not None): sa_connection.close()
+    #
+
+    @staticmethod
+    def _create_engine(engine_settings, prefix = ""):
+        """
+Creates a SQLAlchemy engine based on the given settings.
+
+:param engine_settings: Engine settings dict
+:param prefix: Prefix of SQLAlchemy engine settings keys
+
+:return: (object) SQLAlchemy engine
+:since:  v1.0.0
+        """
+
+        # "Settings.get_dict()" returns a "StackedDict" instance not providing "copy()"
+        engine_settings = { key: engine_settings[key] for key in engine_settings }
+
+        if (Connection._serialized):
+            if (Connection._serialized_pooled):
+                engine_settings[prefix + "poolclass"] = StaticPool
+
+                if (urlsplit(engine_settings[prefix + "url"]).scheme.split("+")[0] == "sqlite"):
+                    # Access is serialized by "_serialized_lock" so the connection may be shared
+                    connect_args = dict(engine_settings.get(prefix + "connect_args", { }))
+                    connect_args.setdefault("check_same_thread", False)
+
+                    engine_settings[prefix + "connect_args"] = connect_args
+                #
+            else: engine_settings[prefix + "poolclass"] = NullPool
+        #
+
+        _return = engine_from_config(engine_settings, prefix = prefix)
+        ConnectionStatistics.register_engine(_return)
+        if (Connection._session_reuse): event.listen(_return, "invalidate", Connection._on_invalidate)
+
+        if (Connection._serialized_pooled): _return.connect().close()
+
+        return _return
+    #
+
     @staticmethod
     def _ensure_settings():
         """
@@ -428,13 +629,34 @@ Check and read settings if needed.
                     url = Settings.get("pas_database_url").replace("__path_base__", path.abspath(Environment.get_base_path()))
 
                     if (not Settings.is_defined("pas_database_table_prefix")): Settings.set("pas_database_table_prefix", "pas")
+
+                    ConnectionStatistics.configure(Settings.get("pas_database_statistics", False),
+                                                   Settings.get("pas_database_slow_query_threshold")
+                                                  )
+
+                    debug = Settings.get("pas_database_debug")
+                    if (debug is None): debug = Connection._is_log_handler_debug()
+
+                    Connection.set_debug(debug, Settings.get("pas_database_threaded_debug", debug))
                     Connection._serialized = (not Settings.get("pas_database_threaded", True))
 
                     if (Connection._serialized):
                         LogLine.debug("pas.database access is serialized", context = "pas_database")
+
+                        # The lock currently held is released by the "with" statement
+                        if (Settings.get("pas_database_lock_fair", False)): Connection._serialized_lock = FairLock()
                         Connection._serialized_lock.timeout = Settings.get("pas_database_lock_timeout", 30)
+
+                        Connection._serialized_pooled = Settings.get("pas_database_serialized_pooled", False)
+                    else:
+                        # StaticPool used for pooled serialized access does not support these
+                        if (Settings.is_defined("pas_database_pool_size")): Settings.set("pas_database_sqlalchemy_pool_size", int(Settings.get("pas_database_pool_size")))
+                        if (Settings.is_defined("pas_database_pool_max_overflow")): Settings.set("pas_database_sqlalchemy_max_overflow", int(Settings.get("pas_database_pool_max_overflow")))
                     #
 
+                    if (Settings.is_defined("pas_database_pool_pre_ping")): Settings.set("pas_database_sqlalchemy_pool_pre_ping", bool(Settings.get("pas_database_pool_pre_ping")))
+                    if (Settings.is_defined("pas_database_pool_recycle")): Settings.set("pas_database_sqlalchemy_pool_recycle", int(Settings.get("pas_database_pool_recycle")))
+
                     url_elements = urlsplit(url)
 
                     Settings.set("x_pas_database_backend_name", url_elements.scheme.split("+")[0])
@@ -457,6 +679,10 @@ Check and read settings if needed.
 
                     Settings.set("pas_database_sqlalchemy_url", url)
 
+                    Connection._session_reuse = Settings.get("pas_database_session_reuse", False)
+
+                    Connection._sa_engine_routing.update(Settings.get("pas_database_engine_routing", { }))
+
                     Connection._settings_initialized = True
                 #
             #
@@ -476,6 +702,26 @@ Returns the connection backend.
         return Settings.get("x_pas_database_backend_name")
     #
 
+    @staticmethod
+    def get_engine(name = None):
+        """
+Returns the configured SQLAlchemy engine of the given name.
+
+:param name: Engine name; None for the default one
+
+:return: (object) SQLAlchemy engine
+:since:  v1.0.0
+        """
+
+        Connection.get_instance()
+
+        if (name is None): _return = Connection._sa_engine
+        elif (name in Connection._sa_engines): _return = Connection._sa_engines[name]
+        else: raise ValueException("Database engine '{0}' is not defined".format(name))
+
+        return _return
+    #
+
     @staticmethod
     def get_instance():
         """
@@ -499,6 +745,74 @@ Get the Connection singleton.
         return _return
     #
 
+    @staticmethod
+    def _get_session_binds():
+        """
+Returns the SQLAlchemy session binds for ORM classes routed to named
+engines.
+
+:return: (dict) SQLAlchemy session binds
+:since:  v1.0.0
+        """
+
+        _return = Connection._sa_binds
+
+        if (_return is None):
+            _return = { }
+
+            for db_class_name, engine_name in Connection._sa_engine_routing.items():
+                if (engine_name not in Connection._sa_engines): raise ValueException("Database engine '{0}' is not defined".format(engine_name))
+
+                db_class = NamedClassLoader.get_class(db_class_name)
+                if (db_class is None): raise ValueException("Database class '{0}' routed to engine '{1}' is invalid".format(db_class_name, engine_name))
+
+                _return[db_class] = Connection._sa_engines[engine_name]
+                if (hasattr(db_class, "__table__")): _return[db_class.__table__] = Connection._sa_engines[engine_name]
+            #
+
+            Connection._sa_binds = _return
+        #
+
+        return _return
+    #
+
+    @staticmethod
+    def _get_read_only_session():
+        """
+Returns a new SQLAlchemy session bound to the configured read-only engine.
+The primary engine is used if no read-only engine is configured or if it is
+not reachable.
+
+:return: (object) SQLAlchemy session
+:since:  v1.0.0
+        """
+
+        # pylint: disable=broad-except
+
+        _return = None
+
+        engine_name = Settings.get("pas_database_read_only_engine")
+
+        if (engine_name is not None):
+            try:
+                if (engine_name not in Connection._sa_engines): raise ValueException("Database engine '{0}' is not defined".format(engine_name))
+
+                _return = Session(Connection._sa_engines[engine_name], binds = Connection._get_session_binds())
+                _return.connection()
+            except Exception as handled_exception:
+                LogLine.warning("pas.database read-only engine '{0}' is not available: {1!r}".format(engine_name, handled_exception), context = "pas_database")
+
+                if (_return is not None): _return.close()
+                _return = None
+            #
+        #
+
+        if (_return is None): _return = Session(Connection._sa_engine, binds = Connection._get_session_binds())
+        event.listen(_return, "before_flush", Connection._on_read_only_before_flush)
+
+        return _return
+    #
+
     @staticmethod
     def get_table_prefix():
         """
@@ -512,6 +826,39 @@ Get the configured database table prefix.
         return Settings.get("pas_database_table_prefix")
     #
 
+    @staticmethod
+    def is_debug():
+        """
+Returns true if debug messages of connection contexts and instances are
+logged.
+
+:return: (bool) True if debug messages are logged
+:since:  v1.0.0
+        """
+
+        return Connection._debug
+    #
+
+    @staticmethod
+    def _is_log_handler_debug():
+        """
+Returns true if the LogHandler logs debug messages of the "pas_database"
+context.
+
+:return: (bool) True if debug messages are logged
+:since:  v1.0.0
+        """
+
+        # pylint: disable=broad-except
+
+        log_handler = NamedClassLoader.get_singleton("dpt_logging.LogHandler", False)
+
+        try: _return = (log_handler is not None and log_handler.get_level("pas_database") == "debug")
+        except Exception: _return = False
+
+        return _return
+    #
+
     @staticmethod
     def is_serialized():
         """
@@ -525,6 +872,80 @@ Returns true if access to a database instance is serialized.
         return Connection._serialized
     #
 
+    @staticmethod
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        """
+sqlalchemy.org: Event fired when a DBAPI connection is to be "invalidated".
+
+:since: v1.0.0
+        """
+
+        # pylint: disable=unused-argument
+
+        with Connection._instance_lock: Connection._sa_engine_generation += 1
+    #
+
+    @staticmethod
+    def _on_read_only_before_flush(session, flush_context, instances):
+        """
+sqlalchemy.org: Execute before flush process has started.
+
+:since: v1.0.0
+        """
+
+        # pylint: disable=unused-argument
+
+        raise ValueException("Changes made in a read-only connection context can not be written")
+    #
+
+    @staticmethod
+    def _release_serialized_lock():
+        """
+Releases the lock serializing access to the underlying database.
+
+:since: v1.0.0
+        """
+
+        if (ConnectionStatistics.is_enabled()): ConnectionStatistics.end_lock_hold()
+        Connection._serialized_lock.release()
+    #
+
+    @staticmethod
+    def register_engine_route(db_class_name, engine_name):
+        """
+Routes the given ORM class to the named engine. Only sessions created
+afterwards will use the route.
+
+:param db_class_name: ORM class name (e.g. "pas_database.orm.KeyStore")
+:param engine_name: Engine name
+
+:since: v1.0.0
+        """
+
+        with Connection._instance_lock:
+            Connection._sa_engine_routing[db_class_name] = engine_name
+            Connection._sa_binds = None
+        #
+    #
+
+    @staticmethod
+    def set_debug(debug, threaded_debug = None):
+        """
+Activates or deactivates logging of debug messages of connection contexts
+and instances. Calls are skipped before any arguments are formatted if
+deactivated.
+
+:param debug: True to log debug messages
+:param threaded_debug: True to log thread related debug messages; None to
+                       keep the current value
+
+:since: v1.0.0
+        """
+
+        Connection._debug = bool(debug)
+        if (threaded_debug is not None): Connection._threaded_debug = bool(threaded_debug)
+    #
+
     @staticmethod
     def wrap_callable(_callable):
         """
@@ -0,0 +1,479 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;database
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;mpl2
+----------------------------------------------------------------------------
+#echo(pasDatabaseVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error, no-name-in-module, unused-argument
+
+from threading import current_thread, local
+from time import perf_counter
+
+from dpt_logging import LogLine
+from dpt_threading.thread_lock import ThreadLock
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, mapper
+
+class ConnectionStatistics(object):
+    """
+"ConnectionStatistics" collects counters of executed queries, loaded rows,
+flushes, time spent in the database and waiting for serialized access.
+Counters are kept per thread, merged when read globally, and for the most
+outer connection context of each thread. Statements exceeding the slow query
+threshold are logged.
+
+:author:     direct Netware Group et al.
+:copyright:  (C) direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: database
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;mpl2
+             Mozilla Public License, v. 2.0
+    """
+
+    COUNTERS = ( "queries", "slow_queries", "rows_loaded", "rows_affected", "flushes", "checkouts", "db_time", "lock_wait_time" )
+    """
+Names of the collected counters
+    """
+
+    LOCK_WAIT_BUCKETS = ( 0.001, 0.01, 0.1, 1, 10 )
+    """
+Upper bounds in seconds of the lock wait time histogram buckets
+    """
+
+    _counters = dict.fromkeys(COUNTERS, 0)
+    """
+Counters of threads no longer alive
+    """
+    _counters_reset = dict.fromkeys(COUNTERS, 0)
+    """
+Merged counter values at the time of the last reset
+    """
+    _enabled = False
+    """
+True if statistics are collected
+    """
+    _listeners_registered = False
+    """
+True if the global ORM listeners are registered
+    """
+    _local = local()
+    """
+Thread-local counters
+    """
+    _lock = ThreadLock()
+    """
+Thread safety lock
+    """
+    _lock_holder = None
+    """
+Thread ID and name of the thread holding serialized access
+    """
+    _lock_timeouts = 0
+    """
+Number of timeouts waiting for serialized access
+    """
+    _lock_wait_histogram = [ 0 ] * (len(LOCK_WAIT_BUCKETS) + 1)
+    """
+Number of lock acquisitions per wait time bucket
+    """
+    _lock_waiting = 0
+    """
+Number of threads waiting for serialized access
+    """
+    _slow_query_threshold = None
+    """
+Statements taking longer than this number of seconds are logged
+    """
+    _thread_counters = [ ]
+    """
+List of threads with their counters
+    """
+
+    __slots__ = [ ]
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    @staticmethod
+    def add(name, value = 1):
+        """
+Adds the given value to the counter of the current thread and of its active
+connection context.
+
+:param name: Counter name
+:param value: Value to add
+
+:since: v1.0.0
+        """
+
+        ConnectionStatistics._get_thread_counters()[name] += value
+
+        counters = getattr(ConnectionStatistics._local, "context_counters", None)
+        if (counters is not None): counters[name] += value
+    #
+
+    @staticmethod
+    def begin_context():
+        """
+Resets the thread-local counters for a new most outer connection context.
+
+:since: v1.0.0
+        """
+
+        ConnectionStatistics._local.context_counters = dict.fromkeys(ConnectionStatistics.COUNTERS, 0)
+    #
+
+    @staticmethod
+    def begin_lock_wait():
+        """
+Registers a thread starting to wait for serialized access.
+
+:since: v1.0.0
+        """
+
+        with ConnectionStatistics._lock: ConnectionStatistics._lock_waiting += 1
+    #
+
+    @staticmethod
+    def configure(enabled, slow_query_threshold = None):
+        """
+Configures the statistics collection. Engines created before collection is
+activated are not instrumented.
+
+:param enabled: True to collect statistics
+:param slow_query_threshold: Statements taking longer than this number of
+                             seconds are logged; None to deactivate
+
+:since: v1.0.0
+        """
+
+        with ConnectionStatistics._lock:
+            ConnectionStatistics._enabled = bool(enabled or slow_query_threshold is not None)
+            ConnectionStatistics._slow_query_threshold = (None if (slow_query_threshold is None) else float(slow_query_threshold))
+
+            if (ConnectionStatistics._enabled and (not ConnectionStatistics._listeners_registered)):
+                event.listen(mapper, "load", ConnectionStatistics._on_load)
+                event.listen(Session, "after_flush", ConnectionStatistics._on_after_flush)
+
+                ConnectionStatistics._listeners_registered = True
+            #
+        #
+    #
+
+    @staticmethod
+    def end_context():
+        """
+Keeps the thread-local counters of the most outer connection context exited
+and stops counting for it.
+
+:since: v1.0.0
+        """
+
+        ConnectionStatistics._local.last_context_counters = getattr(ConnectionStatistics._local, "context_counters", None)
+        ConnectionStatistics._local.context_counters = None
+    #
+
+    @staticmethod
+    def end_lock_hold():
+        """
+Registers the end of serialized access of the holding thread.
+
+:since: v1.0.0
+        """
+
+        with ConnectionStatistics._lock: ConnectionStatistics._lock_holder = None
+    #
+
+    @staticmethod
+    def end_lock_wait(duration, acquired = True):
+        """
+Registers a thread finished waiting for serialized access.
+
+:param duration: Wait time in seconds
+:param acquired: False if a timeout occurred
+
+:since: v1.0.0
+        """
+
+        bucket = len(ConnectionStatistics.LOCK_WAIT_BUCKETS)
+
+        for position, upper_bound in enumerate(ConnectionStatistics.LOCK_WAIT_BUCKETS):
+            if (duration <= upper_bound):
+                bucket = position
+                break
+            #
+        #
+
+        with ConnectionStatistics._lock:
+            ConnectionStatistics._lock_waiting -= 1
+            ConnectionStatistics._lock_wait_histogram[bucket] += 1
+
+            if (acquired):
+                thread = current_thread()
+                ConnectionStatistics._lock_holder = ( thread.ident, thread.name )
+            else: ConnectionStatistics._lock_timeouts += 1
+        #
+
+        ConnectionStatistics.add("lock_wait_time", duration)
+    #
+
+    @staticmethod
+    def get():
+        """
+Returns the global counters merged from all threads. Times are given in
+seconds.
+
+:return: (dict) Counters
+:since:  v1.0.0
+        """
+
+        with ConnectionStatistics._lock:
+            counters = ConnectionStatistics._get_merged_counters()
+            return { name: counters[name] - ConnectionStatistics._counters_reset[name] for name in counters }
+        #
+    #
+
+    @staticmethod
+    def get_context():
+        """
+Returns a copy of the counters of the active or last connection context of
+the current thread.
+
+:return: (dict) Counters; None if not collected
+:since:  v1.0.0
+        """
+
+        counters = getattr(ConnectionStatistics._local, "context_counters", None)
+        if (counters is None): counters = getattr(ConnectionStatistics._local, "last_context_counters", None)
+
+        return (None if (counters is None) else counters.copy())
+    #
+
+    @staticmethod
+    def get_lock():
+        """
+Returns the state of serialized access. The wait time histogram maps the
+upper bound of each bucket in seconds to the number of acquisitions.
+
+:return: (dict) Lock holder, waiting threads, timeouts and wait time
+         histogram
+:since:  v1.0.0
+        """
+
+        with ConnectionStatistics._lock:
+            holder = ConnectionStatistics._lock_holder
+
+            histogram = { str(upper_bound): ConnectionStatistics._lock_wait_histogram[position]
+                          for position, upper_bound in enumerate(ConnectionStatistics.LOCK_WAIT_BUCKETS)
+                        }
+
+            histogram['inf'] = ConnectionStatistics._lock_wait_histogram[-1]
+
+            return { "holder": (None if (holder is None) else { "thread_id": holder[0], "thread_name": holder[1] }),
+                     "waiting": ConnectionStatistics._lock_waiting,
+                     "timeouts": ConnectionStatistics._lock_timeouts,
+                     "wait_histogram": histogram
+                   }
+        #
+    #
+
+    @staticmethod
+    def _get_merged_counters():
+        """
+Returns the sum of the counters of all threads. Counters of threads no longer
+alive are merged permanently. The caller must hold the lock.
+
+:return: (dict) Counters
+:since:  v1.0.0
+        """
+
+        _return = ConnectionStatistics._counters.copy()
+        thread_counters = [ ]
+
+        for thread, counters in ConnectionStatistics._thread_counters:
+            if (thread.is_alive()): thread_counters.append(( thread, counters ))
+            else:
+                for name in counters: ConnectionStatistics._counters[name] += counters[name]
+            #
+
+            for name in counters: _return[name] += counters[name]
+        #
+
+        ConnectionStatistics._thread_counters = thread_counters
+
+        return _return
+    #
+
+    @staticmethod
+    def _get_thread_counters():
+        """
+Returns the counters of the current thread. Only the first call of a thread
+acquires the lock to register them.
+
+:return: (dict) Counters
+:since:  v1.0.0
+        """
+
+        _return = getattr(ConnectionStatistics._local, "counters", None)
+
+        if (_return is None):
+            _return = dict.fromkeys(ConnectionStatistics.COUNTERS, 0)
+            ConnectionStatistics._local.counters = _return
+
+            with ConnectionStatistics._lock: ConnectionStatistics._thread_counters.append(( current_thread(), _return ))
+        #
+
+        return _return
+    #
+
+    @staticmethod
+    def is_enabled():
+        """
+Returns true if statistics are collected.
+
+:return: (bool) True if collected
+:since:  v1.0.0
+        """
+
+        return ConnectionStatistics._enabled
+    #
+
+    @staticmethod
+    def _on_after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        """
+sqlalchemy.org: Intercept low-level cursor execute() events after execution.
+
+:since: v1.0.0
+        """
+
+        start_times = conn.info.get("pas_database_query_start_times")
+        if (not start_times): return
+
+        duration = perf_counter() - start_times.pop()
+
+        ConnectionStatistics.add("queries")
+        ConnectionStatistics.add("db_time", duration)
+
+        if (cursor.rowcount > 0 and (not statement.lstrip()[:6].upper().startswith("SELECT"))):
+            ConnectionStatistics.add("rows_affected", cursor.rowcount)
+        #
+
+        if (ConnectionStatistics._slow_query_threshold is not None
+            and duration >= ConnectionStatistics._slow_query_threshold
+           ):
+            ConnectionStatistics.add("slow_queries")
+            LogLine.warning("pas.database slow query ({0:.3f}s): {1}".format(duration, statement), context = "pas_database")
+        #
+    #
+
+    @staticmethod
+    def _on_after_flush(session, flush_context):
+        """
+sqlalchemy.org: Execute after flush has completed, but before commit has
+been called.
+
+:since: v1.0.0
+        """
+
+        ConnectionStatistics.add("flushes")
+    #
+
+    @staticmethod
+    def _on_before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        """
+sqlalchemy.org: Intercept low-level cursor execute() events before
+execution.
+
+:since: v1.0.0
+        """
+
+        conn.info.setdefault("pas_database_query_start_times", [ ]).append(perf_counter())
+    #
+
+    @staticmethod
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        """
+sqlalchemy.org: Called when a connection is retrieved from the Pool.
+
+:since: v1.0.0
+        """
+
+        ConnectionStatistics.add("checkouts")
+    #
+
+    @staticmethod
+    def _on_handle_error(exception_context):
+        """
+sqlalchemy.org: Intercept all exceptions processed by the Connection.
+
+:since: v1.0.0
+        """
+
+        if (exception_context.connection is not None):
+            start_times = exception_context.connection.info.get("pas_database_query_start_times")
+            if (start_times): start_times.pop()
+        #
+    #
+
+    @staticmethod
+    def _on_load(target, context):
+        """
+sqlalchemy.org: Receive an object instance after it has been created via
+__new__, and after initial attribute population has occurred.
+
+:since: v1.0.0
+        """
+
+        ConnectionStatistics.add("rows_loaded")
+    #
+
+    @staticmethod
+    def register_engine(engine):
+        """
+Instruments the given SQLAlchemy engine if statistics are collected.
+
+:param engine: SQLAlchemy engine
+
+:since: v1.0.0
+        """
+
+        if (ConnectionStatistics._enabled):
+            event.listen(engine, "before_cursor_execute", ConnectionStatistics._on_before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", ConnectionStatistics._on_after_cursor_execute)
+            event.listen(engine, "handle_error", ConnectionStatistics._on_handle_error)
+            event.listen(engine.pool, "checkout", ConnectionStatistics._on_checkout)
+        #
+    #
+
+    @staticmethod
+    def reset():
+        """
+Resets the global counters and the lock wait time histogram.
+
+:since: v1.0.0
+        """
+
+        with ConnectionStatistics._lock:
+            # Counters of other threads are only written by themselves
+            ConnectionStatistics._counters_reset = ConnectionStatistics._get_merged_counters()
+            ConnectionStatistics._lock_timeouts = 0
+            ConnectionStatistics._lock_wait_histogram = [ 0 ] * (len(ConnectionStatistics.LOCK_WAIT_BUCKETS) + 1)
+        #
+    #
+#
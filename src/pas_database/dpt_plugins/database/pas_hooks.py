@@ -19,6 +19,7 @@ https://www.direct-netware.de/redirect?licenses;mpl2
 
 from dpt_module_loader import NamedClassLoader
 from dpt_plugins import Hook
+from dpt_settings import Settings
 
 from ...orm import Abstract
 from ...schema import Schema
@@ -34,11 +35,9 @@ Called for "pas.Database.applySchema.after"
 :since:  v1.0.0
     """
 
-    key_store_class = NamedClassLoader.get_class("pas_database.orm.KeyStore")
-    Schema.apply_version(key_store_class)
-
-    schema_version_class = NamedClassLoader.get_class("pas_database.orm.SchemaVersion")
-    Schema.apply_version(schema_version_class)
+    Schema.apply_versions([ NamedClassLoader.get_class("pas_database.orm.KeyStore"),
+                            NamedClassLoader.get_class("pas_database.orm.SchemaVersion")
+                          ])
 
     return last_return
 #
@@ -60,6 +59,39 @@ Load and register all SQLAlchemy objects to generate database tables.
     return last_return
 #
 
+def on_shutdown(params, last_return = None):
+    """
+Called for "pas.Status.onShutdown"
+
+:param params: Parameter specified
+:param last_return: The return value from the last hook called.
+
+:return: (mixed) Return value
+:since:  v1.0.0
+    """
+
+    NamedClassLoader.get_class("pas_database.instances.KeyStoreSweeper").stop_instance()
+    return last_return
+#
+
+def on_startup(params, last_return = None):
+    """
+Called for "pas.Status.onStartup"
+
+:param params: Parameter specified
+:param last_return: The return value from the last hook called.
+
+:return: (mixed) Return value
+:since:  v1.0.0
+    """
+
+    if (Settings.get("pas_database_key_store_sweeper", True)
+        and (not Settings.get("pas_database_auto_maintenance", False))
+       ): NamedClassLoader.get_class("pas_database.instances.KeyStoreSweeper").start_instance()
+
+    return last_return
+#
+
 def register_plugin():
     """
 Register plugin hooks.
@@ -69,6 +101,8 @@ Register plugin hooks.
 
     Hook.register("pas.Database.applySchema.after", after_apply_schema)
     Hook.register("pas.Database.loadAll", load_all)
+    Hook.register("pas.Status.onShutdown", on_shutdown)
+    Hook.register("pas.Status.onStartup", on_startup)
 #
 
 def unregister_plugin():
@@ -80,4 +114,6 @@ Unregister plugin hooks.
 
     Hook.unregister("pas.Database.applySchema.after", after_apply_schema)
     Hook.unregister("pas.Database.loadAll", load_all)
+    Hook.unregister("pas.Status.onShutdown", on_shutdown)
+    Hook.unregister("pas.Status.onStartup", on_startup)
 #
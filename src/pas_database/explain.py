@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;database
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;mpl2
+----------------------------------------------------------------------------
+#echo(pasDatabaseVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=abstract-method,unused-argument
+
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+class Explain(Executable, ClauseElement):
+    """
+"Explain" is an executable SQLAlchemy construct returning the query plan of
+the given statement. PostgreSQL returns it JSON encoded.
+
+:author:     direct Netware Group et al.
+:copyright:  (C) direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: database
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;mpl2
+             Mozilla Public License, v. 2.0
+    """
+
+    inherit_cache = False
+    """
+sqlalchemy.org: Indicate if this construct should make use of the cache
+key generation scheme used by its immediate superclass.
+    """
+
+    def __init__(self, statement):
+        """
+Constructor __init__(Explain)
+
+:param statement: SQLAlchemy statement to be explained
+
+:since: v1.0.0
+        """
+
+        self.statement = statement
+        """
+SQLAlchemy statement to be explained
+        """
+    #
+#
+
+@compiles(Explain)
+def _compile_explain(element, compiler, **kwargs):
+    """
+Compiles the "Explain" construct for generic backends.
+
+:return: (str) SQL statement
+:since:  v1.0.0
+    """
+
+    return "EXPLAIN {0}".format(compiler.process(element.statement, **kwargs))
+#
+
+@compiles(Explain, "postgresql")
+def _compile_explain_postgresql(element, compiler, **kwargs):
+    """
+Compiles the "Explain" construct for PostgreSQL.
+
+:return: (str) SQL statement
+:since:  v1.0.0
+    """
+
+    return "EXPLAIN (FORMAT JSON) {0}".format(compiler.process(element.statement, **kwargs))
+#
+
+@compiles(Explain, "sqlite")
+def _compile_explain_sqlite(element, compiler, **kwargs):
+    """
+Compiles the "Explain" construct for SQLite.
+
+:return: (str) SQL statement
+:since:  v1.0.0
+    """
+
+    return "EXPLAIN QUERY PLAN {0}".format(compiler.process(element.statement, **kwargs))
+#
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;database
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;mpl2
+----------------------------------------------------------------------------
+#echo(pasDatabaseVersion)#
+#echo(__FILEPATH__)#
+"""
+
+from collections import deque
+from threading import Lock, get_ident
+
+from dpt_runtime.io_exception import IOException
+
+class FairLock(object):
+    """
+"FairLock" is a reentrant thread lock granted to waiting threads in FIFO
+order. Long-running holders can not starve threads waiting for a short time
+only because they re-acquire the lock first.
+
+:author:     direct Netware Group et al.
+:copyright:  (C) direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: database
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;mpl2
+             Mozilla Public License, v. 2.0
+    """
+
+    __slots__ = [ "_depth", "_mutex", "_owner", "timeout", "_waiters" ]
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    def __init__(self, timeout = None):
+        """
+Constructor __init__(FairLock)
+
+:param timeout: Timeout in seconds; None to wait forever
+
+:since: v1.0.0
+        """
+
+        self._depth = 0
+        """
+Number of times the owning thread acquired the lock
+        """
+        self._mutex = Lock()
+        """
+Lock protecting the internal state
+        """
+        self._owner = None
+        """
+Thread ID of the lock owner
+        """
+        self.timeout = timeout
+        """
+Timeout in seconds
+        """
+        self._waiters = deque()
+        """
+Thread IDs and locks of threads waiting in FIFO order
+        """
+    #
+
+    def __enter__(self):
+        """
+python.org: Enter the runtime context related to this object.
+
+:since: v1.0.0
+        """
+
+        self.acquire()
+    #
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+python.org: Exit the runtime context related to this object.
+
+:return: (bool) True to suppress exceptions
+:since:  v1.0.0
+        """
+
+        self.release()
+        return False
+    #
+
+    @property
+    def owner(self):
+        """
+Returns the thread ID of the lock owner.
+
+:return: (int) Thread ID; None if not locked
+:since:  v1.0.0
+        """
+
+        return self._owner
+    #
+
+    @property
+    def waiting(self):
+        """
+Returns the number of threads waiting for the lock.
+
+:return: (int) Number of waiting threads
+:since:  v1.0.0
+        """
+
+        return len(self._waiters)
+    #
+
+    def acquire(self):
+        """
+Acquires the lock.
+
+:since: v1.0.0
+        """
+
+        thread_id = get_ident()
+
+        with self._mutex:
+            if (self._owner == thread_id):
+                self._depth += 1
+                return
+            #
+
+            if (self._owner is None and len(self._waiters) < 1):
+                self._owner = thread_id
+                self._depth = 1
+
+                return
+            #
+
+            waiter = ( thread_id, Lock() )
+            waiter[1].acquire()
+
+            self._waiters.append(waiter)
+        #
+
+        if (not waiter[1].acquire(timeout = (-1 if (self.timeout is None) else self.timeout))):
+            with self._mutex:
+                # The lock may have been handed over after the timeout occurred
+                if (waiter in self._waiters):
+                    self._waiters.remove(waiter)
+                    raise IOException("Timeout occurred while waiting for the lock")
+                #
+            #
+        #
+    #
+
+    def release(self):
+        """
+Releases the lock.
+
+:since: v1.0.0
+        """
+
+        with self._mutex:
+            if (self._owner != get_ident()): raise IOException("Lock released by a thread not owning it")
+
+            self._depth -= 1
+
+            if (self._depth < 1):
+                if (len(self._waiters) > 0):
+                    waiter = self._waiters.popleft()
+
+                    self._owner = waiter[0]
+                    self._depth = 1
+
+                    waiter[1].release()
+                else: self._owner = None
+            #
+        #
+    #
+#
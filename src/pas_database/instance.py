@@ -30,14 +30,22 @@ from dpt_runtime.type_exception import TypeException
 from dpt_runtime.value_exception import ValueException
 from dpt_threading.thread_lock import ThreadLock
 
+from dpt_json import JsonResource
+
 from sqlalchemy.inspection import inspect
-from sqlalchemy.engine.result import ResultProxy
+from sqlalchemy.sql.expression import func, text
+
+try: from sqlalchemy.engine import Result
+except ImportError: from sqlalchemy.engine.result import ResultProxy as Result
 
 from .connection import Connection
+from .explain import Explain
 from .instance_iterator import InstanceIterator
 from .nothing_matched_exception import NothingMatchedException
 from .orm.abstract import Abstract
+from .read_only_context import ReadOnlyContext
 from .sort_definition import SortDefinition
+from .transaction_context import TransactionContext
 
 class Instance(MutableMapping):
     """
@@ -148,6 +156,7 @@ python.org: Called to implement evaluation of self[key].
 :since:  v1.0.0
         """
 
+        if (self._is_data_attribute_accessible(key)): return self._get_data_attribute(key)
         with self: return self._get_data_attribute(key)
     #
 
@@ -214,7 +223,10 @@ python.org: Called to implement assignment to self[key].
 :since: v1.0.0
         """
 
-        with self: self._set_data_attribute(key, value)
+        if (self._is_context_entered()): self._set_data_attribute(key, value)
+        else:
+            with self: self._set_data_attribute(key, value)
+        #
     #
 
     @property
@@ -277,7 +289,7 @@ Applies the sort order to the given SQLAlchemy query instance.
 :since:  v1.0.0
         """
 
-        if (self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}._apply_db_sort_definition()- (#echo(__LINE__)#)", self, context = "pas_database")
+        if (Connection.is_debug() and self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}._apply_db_sort_definition()- (#echo(__LINE__)#)", self, context = "pas_database")
         _return = query
 
         sort_definition = self._get_db_sort_definition(context)
@@ -297,7 +309,7 @@ Deletes this entry from the database.
 :since:  v1.0.0
         """
 
-        if (self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}.delete()- (#echo(__LINE__)#)", self, context = "pas_database")
+        if (Connection.is_debug() and self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}.delete()- (#echo(__LINE__)#)", self, context = "pas_database")
         _return = True
 
         with self:
@@ -389,7 +401,7 @@ Enters the connection context.
 
         # pylint: disable=broad-except, protected-access
 
-        if (self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}.__enter__()- (#echo(__LINE__)#)", self, context = "pas_database")
+        if (Connection.is_debug() and self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}.__enter__()- (#echo(__LINE__)#)", self, context = "pas_database")
 
         is_connection_context_entered = False
 
@@ -435,7 +447,7 @@ Exits the connection context.
 
         # pylint: disable=broad-except,protected-access
 
-        if (self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}.__exit__()- (#echo(__LINE__)#)", self, context = "pas_database")
+        if (Connection.is_debug() and self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}.__exit__()- (#echo(__LINE__)#)", self, context = "pas_database")
 
         self.local.context_depth -= 1
 
@@ -478,7 +490,7 @@ Returns the requested attributes.
 :since:  v1.0.0
         """
 
-        if (self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}.get_data_attributes()- (#echo(__LINE__)#)", self, context = "pas_database")
+        if (Connection.is_debug() and self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}.get_data_attributes()- (#echo(__LINE__)#)", self, context = "pas_database")
         _return = { }
 
         with self:
@@ -518,7 +530,7 @@ Returns the default sort definition list.
 :since:  v1.0.0
         """
 
-        if (self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}._get_default_sort_definition()- (#echo(__LINE__)#)", self, context = "pas_database")
+        if (Connection.is_debug() and self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}._get_default_sort_definition()- (#echo(__LINE__)#)", self, context = "pas_database")
         return SortDefinition()
     #
 
@@ -545,6 +557,42 @@ Insert the instance into the database.
         if (inspect(self.local.db_instance).transient): self.local.connection.add(self.local.db_instance)
     #
 
+    def _is_context_entered(self):
+        """
+Returns true if the context of this instance has been entered by the
+current thread already.
+
+:return: (bool) True if entered
+:since:  v1.0.0
+        """
+
+        return (getattr(self.local, "context_depth", 0) > 0)
+    #
+
+    def _is_data_attribute_accessible(self, attribute):
+        """
+Returns true if the given attribute can be read without entering the
+connection context. This is the case if the context has been entered
+already or if the attribute value is loaded for the SQLAlchemy database
+instance.
+
+:param attribute: Requested attribute
+
+:return: (bool) True if accessible
+:since:  v1.0.0
+        """
+
+        if (self._is_context_entered()): _return = True
+        else:
+            db_instance = getattr(self.local, "db_instance", None)
+
+            # Expired and deferred attributes are not part of the instance dict
+            _return = (db_instance is not None and attribute in db_instance.__dict__)
+        #
+
+        return _return
+    #
+
     def is_data_attribute_defined(self, attribute):
         """
 Checks the given attribute if it is defined for the entity.
@@ -598,7 +646,7 @@ Reload instance data from the database.
 :since: v1.0.0
         """
 
-        if (self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}.reload()- (#echo(__LINE__)#)", self, context = "pas_database")
+        if (Connection.is_debug() and self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}.reload()- (#echo(__LINE__)#)", self, context = "pas_database")
 
         with self._lock:
             if (not hasattr(self.local, "db_instance")): self._ensure_thread_local_instance()
@@ -624,7 +672,7 @@ Saves changes of the instance into the database.
 :since: v1.0.0
         """
 
-        if (self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}.save()- (#echo(__LINE__)#)", self, context = "pas_database")
+        if (Connection.is_debug() and self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}.save()- (#echo(__LINE__)#)", self, context = "pas_database")
 
         with self:
             self._ensure_transaction_context()
@@ -670,7 +718,7 @@ Sets the sort definition list.
 :since: v1.0.0
         """
 
-        if (self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}.set_sort_definition()- (#echo(__LINE__)#)", self, context = "pas_database")
+        if (Connection.is_debug() and self._log_handler is not None): self._log_handler.debug("#echo(__FILEPATH__)# -{0!r}.set_sort_definition()- (#echo(__LINE__)#)", self, context = "pas_database")
 
         if (not isinstance(sort_definition, SortDefinition)): raise TypeException("Sort definition type given is not supported")
 
@@ -701,6 +749,54 @@ Updates the instance already saved to the database.
         pass
     #
 
+    @classmethod
+    def bulk_insert(cls, rows, upsert_keys = None, batch_size = 1000):
+        """
+Inserts the given rows with multi-row statements within one transaction.
+Rows conflicting with existing ones in the given unique columns are updated
+instead if "upsert_keys" is given. Upserts are executed natively for
+PostgreSQL and for SQLite with SQLAlchemy 1.4 or later and row by row
+otherwise.
+
+:param cls: Encapsulating database instance class
+:param rows: Iterable of dicts with attribute values
+:param upsert_keys: List of unique column names identifying conflicting rows
+:param batch_size: Number of rows sent per statement
+
+:return: (int) Number of rows given
+:since:  v1.0.0
+        """
+
+        db_class = Instance.get_db_class(cls)
+        if (db_class is None): raise ValueException("Encapsulating database class is not valid")
+
+        _return = 0
+
+        with TransactionContext():
+            connection = Connection.get_instance()
+
+            batch = [ ]
+
+            for row in rows:
+                values = cls._get_bulk_insert_values(row)
+
+                # Rows sent with one statement must set the same columns
+                if (len(batch) >= batch_size
+                    or (len(batch) > 0 and values.keys() != batch[0].keys())
+                   ):
+                    _return += Instance._execute_bulk_insert(connection, db_class, batch, upsert_keys)
+                    batch = [ ]
+                #
+
+                batch.append(values)
+            #
+
+            if (len(batch) > 0): _return += Instance._execute_bulk_insert(connection, db_class, batch, upsert_keys)
+        #
+
+        return _return
+    #
+
     @classmethod
     def buffered_iterator(cls, entity, result, *args, **kwargs):
         """
@@ -715,10 +811,68 @@ database instances with an given class.
 :since:  v1.0.0
         """
 
-        if (not isinstance(result, ResultProxy)): raise TypeException("Database result given is invalid")
+        if (not isinstance(result, Result)): raise TypeException("Database result given is invalid")
         return InstanceIterator(entity, result, True, cls, *args, **kwargs)
     #
 
+    @classmethod
+    def _get_bulk_insert_values(cls, row):
+        """
+Returns the column values to be inserted for the given row. The SQLAlchemy
+database class is instantiated to apply its constructor defaults. Columns
+not set are omitted to apply their column defaults.
+
+:param cls: Encapsulating database instance class
+:param row: Dict with attribute values
+
+:return: (dict) Column values
+:since:  v1.0.0
+        """
+
+        db_class = Instance.get_db_class(cls)
+
+        db_instance = db_class(**row)
+        instance_dict = inspect(db_instance).dict
+
+        return { column.key: instance_dict[column.key] for column in db_class.__table__.columns if (column.key in instance_dict) }
+    #
+
+    @classmethod
+    def count(cls, condition_definition = None, approximate = False):
+        """
+Returns the number of entries matching the given condition definition
+without loading them.
+
+:param cls: Encapsulating database instance class
+:param condition_definition: ConditionDefinition instance; None to count all
+:param approximate: True to return an estimate based on the backend
+                    statistics if supported (PostgreSQL)
+
+:return: (int) Number of entries
+:since:  v1.0.0
+        """
+
+        db_class = Instance.get_db_class(cls)
+        if (db_class is None): raise ValueException("Encapsulating database class is not valid")
+
+        with ReadOnlyContext() as connection:
+            _return = None
+
+            if (approximate and connection.get_bind(db_class).dialect.name == "postgresql"):
+                _return = Instance._get_estimated_count(connection, db_class, condition_definition)
+            #
+
+            if (_return is None):
+                query = connection.query(func.count()).select_from(db_class)
+                if (condition_definition is not None): query = condition_definition.apply(db_class, query)
+
+                _return = query.scalar()
+            #
+        #
+
+        return _return
+    #
+
     @staticmethod
     def _data_attribute_property(key):
         """
@@ -739,6 +893,7 @@ Returns the value of the corresponding attribute.
 :since:  v1.0.0
             """
 
+            if (self._is_data_attribute_accessible(key)): return self._get_data_attribute(key)
             with self: return self._get_data_attribute(key)
         #
 
@@ -752,7 +907,10 @@ Sets the value of the corresponding attribute.
 :since: v1.0.0
             """
 
-            with self: self._set_data_attribute(key, value)
+            if (self._is_context_entered()): self._set_data_attribute(key, value)
+            else:
+                with self: self._set_data_attribute(key, value)
+            #
         #
 
         return proxymethod
@@ -779,6 +937,7 @@ Returns the value of the corresponding attribute.
 :since:  v1.0.0
             """
 
+            if (self._is_data_attribute_accessible(key)): return self._get_data_attribute(key)
             with self: return self._get_data_attribute(key)
         #
 
@@ -803,6 +962,79 @@ auto-loading it.
            ): raise ValueException("Given encapsulated database instance is not valid for this encapsulating one")
     #
 
+    @staticmethod
+    def _execute_bulk_insert(connection, db_class, batch, upsert_keys = None):
+        """
+Inserts the given batch of column values setting the same columns.
+
+:param connection: Connection instance
+:param db_class: SQLAlchemy database class
+:param batch: List of dicts with column values
+:param upsert_keys: List of unique column names identifying conflicting rows
+
+:return: (int) Number of rows given
+:since:  v1.0.0
+        """
+
+        if (upsert_keys is not None and (not set(upsert_keys).issubset(batch[0].keys()))):
+            raise ValueException("Rows to be upserted must set all columns given as upsert keys")
+        #
+
+        statement = (db_class.__table__.insert()
+                     if (upsert_keys is None) else
+                     Instance._get_upsert_statement(db_class.__table__,
+                                                    connection.get_bind(db_class).dialect.name,
+                                                    upsert_keys,
+                                                    batch[0].keys()
+                                                   )
+                    )
+
+        if (statement is not None): connection.execute(statement, batch)
+        else:
+            for values in batch:
+                db_query = connection.query(db_class).filter_by(**{ key: values[key] for key in upsert_keys })
+                db_instance = db_query.first()
+
+                if (db_instance is None): connection.add(db_class(**values))
+                else:
+                    for column in db_class.__table__.columns:
+                        if (column.key in values and column.key not in upsert_keys and (not column.primary_key)):
+                            setattr(db_instance, column.key, values[column.key])
+                        #
+                    #
+                #
+            #
+
+            connection.flush()
+        #
+
+        return len(batch)
+    #
+
+    @classmethod
+    def exists(cls, condition_definition = None):
+        """
+Returns true if at least one entry matches the given condition definition.
+
+:param cls: Encapsulating database instance class
+:param condition_definition: ConditionDefinition instance; None to check for
+                             any entry
+
+:return: (bool) True if an entry exists
+:since:  v1.0.0
+        """
+
+        db_class = Instance.get_db_class(cls)
+        if (db_class is None): raise ValueException("Encapsulating database class is not valid")
+
+        with ReadOnlyContext() as connection:
+            query = connection.query(db_class)
+            if (condition_definition is not None): query = condition_definition.apply(db_class, query)
+
+            return connection.query(query.exists()).scalar()
+        #
+    #
+
     @staticmethod
     def get_class(class_name):
         """
@@ -852,6 +1084,88 @@ Returns the query instance for the encapsulating database class given.
         #
     #
 
+    @staticmethod
+    def _get_estimated_count(connection, db_class, condition_definition = None):
+        """
+Returns the number of entries estimated by the PostgreSQL statistics.
+
+:param connection: Connection instance
+:param db_class: SQLAlchemy database class
+:param condition_definition: ConditionDefinition instance
+
+:return: (int) Estimated number of entries; None if not available
+:since:  v1.0.0
+        """
+
+        _return = None
+
+        sa_connection = connection.connection(mapper = db_class)
+
+        if (condition_definition is None):
+            reltuples = sa_connection.execute(text("SELECT reltuples FROM pg_class WHERE oid = CAST(:table_name AS regclass)"),
+                                              { "table_name": db_class.__table__.name }
+                                             ).scalar()
+
+            # reltuples is negative (or zero on old versions) if never analyzed
+            if (reltuples is not None and reltuples > 0): _return = int(reltuples)
+        else:
+            query = condition_definition.apply(db_class, connection.query(db_class))
+            query_plan = sa_connection.execute(Explain(query.statement)).scalar()
+
+            if (isinstance(query_plan, str)): query_plan = JsonResource.json_to_data(query_plan)
+            if (type(query_plan) is list and len(query_plan) > 0): _return = int(query_plan[0]['Plan']['Plan Rows'])
+        #
+
+        return _return
+    #
+
+    @staticmethod
+    def _get_upsert_statement(table, backend_name, upsert_keys, column_keys = None):
+        """
+Returns an INSERT statement updating conflicting rows instead.
+
+:param table: SQLAlchemy table
+:param backend_name: Database backend name
+:param upsert_keys: List of unique column names identifying conflicting rows
+:param column_keys: Keys of the columns inserted; None for all
+
+:return: (object) SQLAlchemy insert statement; None if not supported
+:since:  v1.0.0
+        """
+
+        # pylint: disable=import-outside-toplevel
+
+        _return = None
+
+        try:
+            if (backend_name == "postgresql"): from sqlalchemy.dialects.postgresql import insert
+            elif (backend_name == "sqlite"): from sqlalchemy.dialects.sqlite import insert
+            else: insert = None
+        except ImportError:
+            # SQLite upserts are supported by SQLAlchemy 1.4 or later
+            insert = None
+        #
+
+        if (insert is not None):
+            _return = insert(table)
+
+            update_values = { column.name: _return.excluded[column.name]
+                              for column in table.columns
+                              if ((column_keys is None or column.key in column_keys)
+                                  and column.name not in upsert_keys
+                                  and (not column.primary_key)
+                                 )
+                            }
+
+            _return = (_return.on_conflict_do_nothing(index_elements = upsert_keys)
+                       if (len(update_values) < 1) else
+                       _return.on_conflict_do_update(index_elements = upsert_keys, set_ = update_values)
+                      )
+        #
+
+        return _return
+    #
+
     @classmethod
     def iterator(cls, entity, result, *args, **kwargs):
         """
@@ -866,7 +1180,89 @@ database instances with an given class.
 :since:  v1.0.0
         """
 
-        if (not isinstance(result, ResultProxy)): raise TypeException("Database result given is invalid")
+        if (not isinstance(result, Result)): raise TypeException("Database result given is invalid")
         return InstanceIterator(entity, result, False, cls, *args, **kwargs)
     #
+
+    @classmethod
+    def load_data_attributes(cls, attributes, condition_definition = None, sort_definition = None, offset = 0, limit = None):
+        """
+Returns the requested attributes of all matching entries. Only the
+corresponding columns are selected and no instances are loaded.
+
+:param cls: Encapsulating database instance class
+:param attributes: List of database instance attributes
+:param condition_definition: ConditionDefinition instance
+:param sort_definition: SortDefinition instance
+:param offset: Number of entries to skip
+:param limit: Maximum number of entries; None for all
+
+:return: (list) List of dicts with the requested attributes
+:since:  v1.0.0
+        """
+
+        db_class = Instance.get_db_class(cls)
+        if (db_class is None or (not issubclass(db_class, Abstract))): raise ValueException("Encapsulating database class is not valid")
+
+        columns = [ db_class.get_db_column(attribute) for attribute in attributes ]
+
+        with ReadOnlyContext() as connection:
+            query = connection.query(*columns)
+
+            if (condition_definition is not None): query = condition_definition.apply(db_class, query)
+            if (sort_definition is not None): query = sort_definition.apply(db_class, query)
+
+            if (offset > 0): query = query.offset(offset)
+            if (limit is not None): query = query.limit(limit)
+
+            return [ dict(zip(attributes, row)) for row in query ]
+        #
+    #
+
+    @staticmethod
+    def save_many(instances):
+        """
+Saves the given instances within one transaction. Changes are flushed once
+so that SQLAlchemy may batch the resulting statements.
+
+:param instances: Iterable of Instance objects
+
+:since: v1.0.0
+        """
+
+        with TransactionContext():
+            connection = Connection.get_instance()
+
+            with connection.no_autoflush:
+                for instance in instances: instance.save()
+            #
+
+            connection.flush()
+        #
+    #
+
+    @classmethod
+    def stream_iterator(cls, query = None, batch_size = 1000, *args, **kwargs):
+        """
+Returns an instance wrapping generator streaming the results of the given
+query. Rows are fetched in batches with server-side cursors where supported
+(e.g. PostgreSQL) and "fetchmany()" otherwise. A connection context must be
+active while iterating. The generator does not hold one itself to not keep
+serialized access locked if it is abandoned.
+
+:param cls: Encapsulating database instance class
+:param query: SQLAlchemy query instance; None to stream all entries
+:param batch_size: Number of rows fetched at once
+
+:return: (object) Generator of encapsulating database instances
+:since:  v1.0.0
+        """
+
+        if (Connection.get_instance().get_context_depth() < 1): raise IOException("Streaming requires an active connection context")
+        if (query is None): query = Instance.get_db_class_query(cls)
+
+        return (cls(db_instance, *args, **kwargs)
+                for db_instance in query.yield_per(batch_size).execution_options(stream_results = True)
+               )
+    #
 #
@@ -17,10 +17,16 @@ https://www.direct-netware.de/redirect?licenses;mpl2
 #echo(__FILEPATH__)#
 """
 
+from collections import deque
+from itertools import islice
+
 from dpt_runtime.iterator import Iterator
 
 from sqlalchemy.inspection import inspect
 
+try: from sqlalchemy.engine import CursorResult
+except ImportError: CursorResult = None
+
 from .connection import Connection
 
 class InstanceIterator(Iterator):
@@ -37,13 +43,18 @@ SQLAlchemy database instances with an given class.
              Mozilla Public License, v. 2.0
     """
 
-    __slots__ = [ "args", "buffered", "instance_class", "kwargs", "result" ]
+    POPULATE_CHUNK_SIZE = 500
+    """
+Maximum number of identities refreshed with one query
+    """
+
+    __slots__ = [ "args", "buffer_size", "buffered", "_cursor_instances", "instance_class", "kwargs", "result" ]
     """
 python.org: __slots__ reserves space for the declared variables and prevents
 the automatic creation of __dict__ and __weakref__ for each instance.
     """
 
-    def __init__(self, entity, cursor, buffered = False, instance_class = None, *args, **kwargs):
+    def __init__(self, entity, cursor, buffered = False, instance_class = None, *args, buffer_size = None, **kwargs):
         """
 Constructor __init__(InstanceIterator)
 
@@ -51,6 +62,9 @@ Constructor __init__(InstanceIterator)
 :param cursor: SQLAlchemy result cursor
 :param buffered: True to buffer the result
 :param instance_class: Encapsulating database instance class
+:param buffer_size: Number of results buffered at once; None to buffer the
+                    complete result. A connection context must be active while
+                    iterating if given.
 
 :since: v1.0.0
         """
@@ -58,6 +72,10 @@ Constructor __init__(InstanceIterator)
         self.args = args
         """
 Arguments given to the contructor of the encapsulating database instance
+        """
+        self.buffer_size = buffer_size
+        """
+Number of results buffered at once
         """
         self.buffered = buffered
         """
@@ -71,6 +89,10 @@ Instance class encapsulating the database instance
         """
 Keyword arguments given to the contructor of the encapsulating database
 instance
+        """
+        self._cursor_instances = None
+        """
+SQLAlchemy database instances not buffered yet
         """
         self.result = None
         """
@@ -79,7 +101,7 @@ Results being interated
 
         with Connection.get_instance() as connection:
             if (buffered): self._init_buffered_results(connection, entity, cursor)
-            else: self.result = connection.query(entity).instances(cursor)
+            else: self.result = InstanceIterator._get_cursor_instances(connection, entity, cursor)
         #
     #
 
@@ -91,7 +113,7 @@ python.org: Return an iterator object.
 :since:  v1.0.0
         """
 
-        return (iter(self.result) if (self.instance_class is None) else self)
+        return (iter(self.result) if (self.instance_class is None and (not self.buffered)) else self)
     #
 
     def __next__(self):
@@ -105,8 +127,12 @@ python.org: Return the next item from the container.
         db_instance = None
 
         if (self.buffered):
+            if (len(self.result) < 1 and self._cursor_instances is not None):
+                with Connection.get_instance(): self._fill_buffer()
+            #
+
             if (len(self.result) < 1): raise StopIteration()
-            return self.result.pop(0)
+            return self.result.popleft()
         else:
             db_instance = next(self.result)
 
@@ -117,36 +143,74 @@ python.org: Return the next item from the container.
         #
     #
 
-    def _ensure_populated_db_instance(self, db_instance):
+    def _ensure_populated_db_instances(self, db_instances):
         """
-Loads and initializes instances for the buffer.
+Refreshes expired SQLAlchemy database instances of the given list with one
+query per database class and chunk of identities.
 
-:param entity: SQLAlchemy database entity
-:param cursor: SQLAlchemy result cursor
+:param db_instances: List of SQLAlchemy database instances
 
 :since: v1.0.0
         """
 
-        _return = db_instance
+        expired_identities = { }
 
-        if (self.instance_class is None
-            or (not issubclass(self.instance_class.get_db_class(self.instance_class),
-                               db_instance.__class__
-                              )
-               )
-           ):
-            instance_state = inspect(db_instance)
-
-            if (len(instance_state.expired_attributes) > 0):
-                _return = (Connection.get_instance()
-                           .query(db_instance.__class__)
-                           .populate_existing()
-                           .get(instance_state.identity)
-                          )
+        for db_instance in db_instances:
+            if (self.instance_class is None
+                or (not issubclass(self.instance_class.get_db_class(self.instance_class),
+                                   db_instance.__class__
+                                  )
+                   )
+               ):
+                instance_state = inspect(db_instance)
+
+                if (len(instance_state.expired_attributes) > 0):
+                    db_class = db_instance.__class__
+
+                    if (db_class not in expired_identities): expired_identities[db_class] = [ ]
+                    expired_identities[db_class].append(instance_state.identity)
+                #
             #
         #
 
-        return _return
+        if (len(expired_identities) > 0):
+            connection = Connection.get_instance()
+
+            for db_class, identities in expired_identities.items():
+                primary_key = inspect(db_class).primary_key
+
+                if (len(primary_key) == 1):
+                    for offset in range(0, len(identities), InstanceIterator.POPULATE_CHUNK_SIZE):
+                        ids = [ identity[0] for identity in identities[offset:offset + InstanceIterator.POPULATE_CHUNK_SIZE] ]
+
+                        # Instances in the identity map are refreshed in place
+                        connection.query(db_class).populate_existing().filter(primary_key[0].in_(ids)).all()
+                    #
+                else:
+                    for identity in identities: connection.query(db_class).populate_existing().get(identity)
+                #
+            #
+        #
+    #
+
+    def _fill_buffer(self):
+        """
+Loads and initializes the next instances for the buffer.
+
+:since: v1.0.0
+        """
+
+        db_instances = list(islice(self._cursor_instances, self.buffer_size))
+        self._ensure_populated_db_instances(db_instances)
+
+        for db_instance in db_instances:
+            self.result.append(db_instance
+                               if (self.instance_class is None) else
+                               self.instance_class(db_instance, *self.args, **self.kwargs)
+                              )
+        #
+
+        if (self.buffer_size is None or len(db_instances) < self.buffer_size): self._cursor_instances = None
     #
 
     def _init_buffered_results(self, connection, entity, cursor):
@@ -159,15 +223,29 @@ Loads and initializes instances for the buffer.
 :since: v1.0.0
         """
 
-        self.result = [ ]
+        self.result = deque()
 
-        for db_instance in connection.query(entity).instances(cursor):
-            db_instance = self._ensure_populated_db_instance(db_instance)
+        self._cursor_instances = InstanceIterator._get_cursor_instances(connection, entity, cursor)
+        self._fill_buffer()
+    #
 
-            self.result.append(db_instance
-                               if (self.instance_class is None) else
-                               self.instance_class(db_instance, *self.args, **self.kwargs)
-                              )
-        #
+    @staticmethod
+    def _get_cursor_instances(connection, entity, cursor):
+        """
+Returns an iterator of SQLAlchemy database instances for the given result
+cursor.
+
+:param entity: SQLAlchemy database entity
+:param cursor: SQLAlchemy result cursor
+
+:return: (object) Iterator of SQLAlchemy database instances
+:since:  v1.0.0
+        """
+
+        # SQLAlchemy 1.4 and later return ORM results containing instances already
+        return (connection.query(entity).instances(cursor)
+                if (CursorResult is None or isinstance(cursor, CursorResult)) else
+                cursor.scalars()
+               )
     #
 #
@@ -17,4 +17,28 @@ https://www.direct-netware.de/redirect?licenses;mpl2
 #echo(__FILEPATH__)#
 """
 
+from importlib import import_module
+
 from .key_store import KeyStore
+from .key_store_sweeper import KeyStoreSweeper
+
+_LAZY_IMPORTS = { "AsyncKeyStore": ".async_key_store" }
+"""
+Classes imported on first access only. The asyncio API requires SQLAlchemy
+1.4 or later.
+"""
+
+def __getattr__(name):
+    """
+python.org: Called when a module attribute lookup has not found the
+attribute in the usual places.
+
+:param name: Attribute name
+
+:return: (object) Lazily imported class
+:since:  v1.0.0
+    """
+
+    if (name not in _LAZY_IMPORTS): raise AttributeError("module '{0}' has no attribute '{1}'".format(__name__, name))
+    return getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+#
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;database
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;mpl2
+----------------------------------------------------------------------------
+#echo(pasDatabaseVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error, no-name-in-module
+
+try: from collections.abc import Mapping
+except ImportError: from collections import Mapping
+
+from dpt_json import JsonResource
+from dpt_runtime.binary import Binary
+from dpt_runtime.type_exception import TypeException
+from dpt_runtime.value_exception import ValueException
+
+from sqlalchemy.orm import undefer
+from sqlalchemy.sql.expression import select
+
+from ..async_connection import AsyncConnection
+from ..async_instance import AsyncInstance
+from ..nothing_matched_exception import NothingMatchedException
+from ..orm.key_store import KeyStore as _DbKeyStore
+from .key_store import KeyStore
+
+class AsyncKeyStore(AsyncInstance):
+    """
+Database based encoded key-value store for asyncio based applications.
+
+:author:     direct Netware Group et al.
+:copyright:  (C) direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: database
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;mpl2
+             Mozilla Public License, v. 2.0
+    """
+
+    # pylint: disable=protected-access
+
+    _DB_INSTANCE_CLASS = _DbKeyStore
+    """
+SQLAlchemy database instance class to initialize for new instances.
+    """
+
+    __slots__ = [ "_values" ]
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    def __init__(self, db_instance = None):
+        """
+Constructor __init__(AsyncKeyStore)
+
+:since: v1.0.0
+        """
+
+        AsyncInstance.__init__(self, db_instance)
+
+        self._values = None
+        """
+Instance cached values
+        """
+    #
+
+    @property
+    def is_valid(self):
+        """
+Returns true if the KeyStore entry is active and valid.
+
+:since: v1.0.0
+        """
+
+        return KeyStore._is_db_instance_valid(self._db_instance)
+    #
+
+    @property
+    def value_dict(self):
+        """
+Returns the values originally given as a dict to this KeyStore instance.
+
+:return: (dict) Values from the KeyStore
+:since:  v1.0.0
+        """
+
+        if (self._values is None):
+            self._values = ({ }
+                            if (self._db_instance.value is None) else
+                            JsonResource.json_to_data(self._db_instance.value)
+                           )
+
+            if (self._values is None): raise ValueException("Value of the KeyStore does not contain the expected data format")
+        #
+
+        return self._values
+    #
+
+    @value_dict.setter
+    def value_dict(self, data):
+        """
+Sets the values given as a dict as the value of this KeyStore instance.
+
+:param data: Dict to be set as value
+
+:since: v1.0.0
+        """
+
+        if (not isinstance(data, Mapping)): raise TypeException("Value data type given is invalid")
+        self._values = (data if (type(data) is dict) else dict(data))
+    #
+
+    async def delete(self):
+        """
+Deletes this entry from the database.
+
+:return: (bool) True on success
+:since:  v1.0.0
+        """
+
+        async with AsyncConnection.get_instance() as connection:
+            if (self.is_known):
+                KeyStore._invalidate_cache_on_commit(connection.get_session().sync_session,
+                                                     self._db_instance.id,
+                                                     self._db_instance.key
+                                                    )
+            #
+
+            return await AsyncInstance.delete(self)
+        #
+    #
+
+    async def save(self):
+        """
+Saves changes of the database task instance.
+
+:since: v1.0.0
+        """
+
+        if (self._values is not None):
+            self._db_instance.value = Binary.utf8(JsonResource().data_to_json(self._values))
+        #
+
+        async with AsyncConnection.get_instance() as connection:
+            await AsyncInstance.save(self)
+
+            KeyStore._invalidate_cache_on_commit(connection.get_session().sync_session,
+                                                 self._db_instance.id,
+                                                 self._db_instance.key
+                                                )
+        #
+    #
+
+    def _set_data_attribute(self, attribute, value):
+        """
+Sets data for the requested attribute.
+
+:param attribute: Requested attribute
+:param value: Value for the requested attribute
+
+:since: v1.0.0
+        """
+
+        if (attribute == "value"):
+            self.value_dict = (value if (isinstance(value, Mapping)) else JsonResource.json_to_data(value))
+        else:
+            if (attribute == "key"): value = Binary.utf8(value)
+            AsyncInstance._set_data_attribute(self, attribute, value)
+        #
+    #
+
+    @classmethod
+    async def load_id(cls, _id):
+        """
+Load KeyStore value by ID.
+
+:param cls: Expected encapsulating database instance class
+:param _id: KeyStore ID
+
+:return: (object) AsyncKeyStore instance on success
+:since:  v1.0.0
+        """
+
+        if (_id is None): raise NothingMatchedException("KeyStore ID is invalid")
+
+        return await AsyncKeyStore._load(cls, _DbKeyStore.id == _id, "KeyStore ID '{0}' not found".format(_id))
+    #
+
+    @classmethod
+    async def load_key(cls, key):
+        """
+Load KeyStore value by key.
+
+:param cls: Expected encapsulating database instance class
+:param key: KeyStore key
+
+:return: (object) AsyncKeyStore instance on success
+:since:  v1.0.0
+        """
+
+        if (key is None): raise NothingMatchedException("KeyStore key is invalid")
+        return await AsyncKeyStore._load(cls, _DbKeyStore.key == key, "KeyStore key '{0}' not found".format(key))
+    #
+
+    @staticmethod
+    async def _load(cls, condition, error_message):
+        """
+Load a valid KeyStore entry matching the given condition from database.
+
+:param cls: Expected encapsulating database instance class
+:param condition: SQLAlchemy condition
+:param error_message: Message of the exception raised if nothing matched
+
+:return: (object) AsyncKeyStore instance on success
+:since:  v1.0.0
+        """
+
+        # The value can not be loaded on first access without I/O later on
+        statement = select(_DbKeyStore).options(undefer(_DbKeyStore.value)).where(condition).limit(1)
+
+        async with AsyncConnection.get_instance() as connection:
+            result = await connection.execute(statement)
+            db_instance = result.scalars().first()
+        #
+
+        if (db_instance is None or (not KeyStore._is_db_instance_valid(db_instance))): raise NothingMatchedException(error_message)
+        return cls(db_instance)
+    #
+#
@@ -19,7 +19,6 @@ https://www.direct-netware.de/redirect?licenses;mpl2
 
 # pylint: disable=import-error, no-name-in-module
 
-from random import randrange
 from time import time
 
 try: from collections.abc import Mapping
@@ -31,14 +30,22 @@ from dpt_runtime.io_exception import IOException
 from dpt_runtime.type_exception import TypeException
 from dpt_runtime.value_exception import ValueException
 from dpt_settings import Settings
+from dpt_threading.thread_lock import ThreadLock
 
+from sqlalchemy import event
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import undefer
+from sqlalchemy.orm.session import Session, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
 from sqlalchemy.sql.expression import and_
 
 from ..connection import Connection
 from ..instance import Instance
+from ..lru_cache import LruCache
 from ..nothing_matched_exception import NothingMatchedException
 from ..orm.key_store import KeyStore as _DbKeyStore
+from ..read_only_context import ReadOnlyContext
+from ..transaction_context import TransactionContext
 
 class KeyStore(Instance):
     """
@@ -65,6 +72,22 @@ SQLAlchemy database instance class to initialize for new instances.
 python.org: __slots__ reserves space for the declared variables and prevents
 the automatic creation of __dict__ and __weakref__ for each instance.
     """
+    _cache_ids = None
+    """
+LRU cache of KeyStore column values by ID
+    """
+    _cache_initialized = False
+    """
+True after the cache settings have been read
+    """
+    _cache_keys = None
+    """
+LRU cache of KeyStore IDs by key
+    """
+    _cache_lock = ThreadLock()
+    """
+Thread safety lock
+    """
 
     def __init__(self, db_instance = None):
         """
@@ -106,14 +129,7 @@ Returns true if the KeyStore entry is active and valid.
 :since: v1.0.0
         """
 
-        with self:
-            timestamp = time()
-
-            _return = (self.local.db_instance.validity_start_time == 0 or self.local.db_instance.validity_start_time < timestamp)
-            if (_return and self.local.db_instance.validity_end_time != 0 and self.local.db_instance.validity_end_time < timestamp): _return = False
-        #
-
-        return _return
+        with self: return KeyStore._is_db_instance_valid(self.local.db_instance)
     #
 
     @property
@@ -153,6 +169,26 @@ Sets the values given as a dict as the value of this KeyStore instance.
         self._values = (data if (type(data) is dict) else dict(data))
     #
 
+    def delete(self):
+        """
+Deletes this entry from the database.
+
+:return: (bool) True on success
+:since:  v1.0.0
+        """
+
+        with self:
+            if (self.is_known):
+                KeyStore._invalidate_cache_on_commit(self.local.connection.get_session(),
+                                                     self.local.db_instance.id,
+                                                     self.local.db_instance.key
+                                                    )
+            #
+
+            return Instance.delete(self)
+        #
+    #
+
     def _reload(self):
         """
 Implementation of the reloading SQLAlchemy database instance logic.
@@ -183,6 +219,11 @@ Saves changes of the database task instance.
                 KeyStore._db_cleanup()
                 Instance.save(self)
             #
+
+            KeyStore._invalidate_cache_on_commit(self.local.connection.get_session(),
+                                                 self.local.db_instance.id,
+                                                 self.local.db_instance.key
+                                                )
         #
     #
 
@@ -204,6 +245,26 @@ Sets data for the requested attribute.
         #
     #
 
+    @staticmethod
+    def _cache_db_instance(db_instance):
+        """
+Caches the column values of the given KeyStore database instance. Entries
+expire at the end of their validity at the latest.
+
+:param db_instance: SQLAlchemy database instance
+
+:since: v1.0.0
+        """
+
+        if (KeyStore._is_cache_enabled()):
+            values = { column.key: getattr(db_instance, column.key) for column in _DbKeyStore.__table__.columns }
+            expires = (None if (values['validity_end_time'] == 0) else values['validity_end_time'])
+
+            KeyStore._cache_ids.set(values['id'], values, expires)
+            KeyStore._cache_keys.set(values['key'], values['id'], expires)
+        #
+    #
+
     @staticmethod
     def _db_cleanup():
         """
@@ -213,9 +274,7 @@ Cleans up old KeyStore entries from database.
         """
 
         with Connection.get_instance() as connection:
-            validity_ended_condition = and_(_DbKeyStore.validity_end_time > 0,
-                                            _DbKeyStore.validity_end_time < int(time())
-                                           )
+            validity_ended_condition = KeyStore._get_expired_condition()
 
             if (connection.query(_DbKeyStore).filter(validity_ended_condition).delete() > 0):
                 connection.optimize_random(_DbKeyStore)
@@ -224,12 +283,252 @@ Cleans up old KeyStore entries from database.
     #
 
     @staticmethod
-    def _load(cls, db_instance):
+    def delete_expired(batch_size = 1000, batches_max = None):
+        """
+Deletes expired KeyStore entries from database in batches. Each batch is
+committed separately and therefore no connection context may be active.
+
+:param batch_size: Number of entries deleted per batch
+:param batches_max: Maximum number of batches; None to delete all
+
+:return: (int) Number of entries deleted
+:since:  v1.0.0
+        """
+
+        if (Connection.get_instance().get_context_depth() > 0):
+            raise IOException("Expired KeyStore entries can not be deleted within an active connection context")
+        #
+
+        _return = 0
+        batches = 0
+
+        while (batches_max is None or batches < batches_max):
+            with TransactionContext():
+                connection = Connection.get_instance()
+
+                validity_ended_condition = KeyStore._get_expired_condition()
+
+                ids = [ row[0] for row in connection.query(_DbKeyStore.id).filter(validity_ended_condition).limit(batch_size) ]
+
+                deleted = (0
+                           if (len(ids) < 1) else
+                           connection.query(_DbKeyStore).filter(_DbKeyStore.id.in_(ids)).delete(synchronize_session = False)
+                          )
+            #
+
+            _return += deleted
+            batches += 1
+
+            if (len(ids) < batch_size): break
+        #
+
+        if (_return > 0): Connection.get_instance().optimize_random(_DbKeyStore)
+
+        return _return
+    #
+
+    @staticmethod
+    def get_cache_statistics():
+        """
+Returns the statistics of the KeyStore cache.
+
+:return: (dict) Cache statistics for lookups by ID and key; None if disabled
+:since:  v1.0.0
+        """
+
+        return ({ "ids": KeyStore._cache_ids.statistics, "keys": KeyStore._cache_keys.statistics }
+                if (KeyStore._is_cache_enabled()) else
+                None
+               )
+    #
+
+    @staticmethod
+    def _get_cached_db_instance(connection, _id = None, key = None):
+        """
+Returns a KeyStore database instance merged into the session of the given
+connection from cached values. The cache is bypassed within transactions
+and for instances already present in the session to not overwrite
+uncommitted changes.
+
+:param connection: Connection instance
+:param _id: KeyStore ID
+:param key: KeyStore key
+
+:return: (object) SQLAlchemy database instance; None if not cached
+:since:  v1.0.0
+        """
+
+        _return = None
+
+        if (KeyStore._is_cache_enabled() and connection.get_transaction_depth() < 1):
+            if (_id is None and key is not None): _id = KeyStore._cache_keys.get(key)
+
+            values = (None
+                      if (_id is None or identity_key(_DbKeyStore, _id) in connection.identity_map) else
+                      KeyStore._cache_ids.get(_id)
+                     )
+
+            if (values is not None and (key is None or values['key'] == key)):
+                _return = _DbKeyStore(**values)
+                make_transient_to_detached(_return)
+
+                _return = connection.merge(_return, load = False)
+            #
+        #
+
+        return _return
+    #
+
+    @staticmethod
+    def _get_expired_condition():
+        """
+Returns the SQLAlchemy condition matching expired KeyStore entries.
+
+:return: (object) SQLAlchemy condition
+:since:  v1.0.0
+        """
+
+        return and_(_DbKeyStore.validity_end_time > 0, _DbKeyStore.validity_end_time < int(time()))
+    #
+
+    @staticmethod
+    def get_expired_count():
+        """
+Returns the number of expired KeyStore entries in the database.
+
+:return: (int) Number of expired entries
+:since:  v1.0.0
+        """
+
+        with ReadOnlyContext() as connection:
+            return connection.query(_DbKeyStore.id).filter(KeyStore._get_expired_condition()).count()
+        #
+    #
+
+    @staticmethod
+    def _get_invalidated_rows(sa_session, rows):
+        """
+Yields the given rows after removing their cached entries on commit of the
+given session.
+
+:param sa_session: SQLAlchemy session
+:param rows: Iterable of dicts with attribute values
+
+:return: (object) Row generator
+:since:  v1.0.0
+        """
+
+        for row in rows:
+            KeyStore._invalidate_cache_on_commit(sa_session,
+                                                 row.get("id"),
+                                                 (None if (row.get("key") is None) else Binary.utf8(row['key']))
+                                                )
+
+            yield row
+        #
+    #
+
+    @staticmethod
+    def _invalidate_cache(_id, key = None):
+        """
+Removes the KeyStore entry with the given ID and its keys from the cache.
+The entry cached for the given key is removed as well.
+
+:param _id: KeyStore ID; None if only the key is known
+:param key: KeyStore key
+
+:since: v1.0.0
+        """
+
+        if (KeyStore._is_cache_enabled()):
+            ids = { _id }
+            if (key is not None): ids.add(KeyStore._cache_keys.remove(key))
+
+            for cached_id in ids:
+                values = (None if (cached_id is None) else KeyStore._cache_ids.remove(cached_id))
+                if (values is not None): KeyStore._cache_keys.remove(values['key'])
+            #
+        #
+    #
+
+    @staticmethod
+    def _invalidate_cache_on_commit(sa_session, _id, key = None):
+        """
+Removes the KeyStore entry with the given ID and its keys from the cache
+after the most outer transaction of the given session ended. Entries read by
+other threads before the changes are committed are removed as well.
+
+:param sa_session: SQLAlchemy session
+:param _id: KeyStore ID
+:param key: KeyStore key
+
+:since: v1.0.0
+        """
+
+        if (KeyStore._is_cache_enabled()):
+            sa_session.info.setdefault("pas_database_key_store_invalidations", set()).add(( _id, key ))
+        #
+    #
+
+    @staticmethod
+    def _is_cache_enabled():
+        """
+Returns true if the KeyStore cache is enabled.
+
+:return: (bool) True if enabled
+:since:  v1.0.0
+        """
+
+        if (not KeyStore._cache_initialized):
+            with KeyStore._cache_lock:
+                # Thread safety
+                if (not KeyStore._cache_initialized):
+                    cache_size = int(Settings.get("pas_database_key_store_cache_size", 0))
+
+                    if (cache_size > 0):
+                        cache_ttl = Settings.get("pas_database_key_store_cache_ttl", 60)
+
+                        KeyStore._cache_ids = LruCache(cache_size, cache_ttl)
+                        KeyStore._cache_keys = LruCache(cache_size, cache_ttl)
+
+                        event.listen(Session, "after_transaction_end", KeyStore._on_after_transaction_end)
+                    #
+
+                    KeyStore._cache_initialized = True
+                #
+            #
+        #
+
+        return (KeyStore._cache_ids is not None)
+    #
+
+    @staticmethod
+    def _is_db_instance_valid(db_instance):
+        """
+Returns true if the given KeyStore database instance is active and valid.
+
+:param db_instance: SQLAlchemy database instance
+
+:return: (bool) True if valid
+:since:  v1.0.0
+        """
+
+        timestamp = time()
+
+        _return = (db_instance.validity_start_time == 0 or db_instance.validity_start_time < timestamp)
+        if (_return and db_instance.validity_end_time != 0 and db_instance.validity_end_time < timestamp): _return = False
+
+        return _return
+    #
+
+    @staticmethod
+    def _load(cls, db_instance, cache = False):
         """
 Load KeyStore entry from database.
 
 :param cls: Expected encapsulating database instance class
 :param db_instance: SQLAlchemy database instance
+:param cache: True to cache the database instance if it is valid
 
 :return: (object) KeyStore instance on success
 :since:  v1.0.0
@@ -237,20 +536,82 @@ Load KeyStore entry from database.
 
         _return = None
 
-        with Connection.get_instance() as connection:
-            if ((not Settings.get("pas_database_auto_maintenance", False)) and randrange(0, 3) < 1): cls._db_cleanup()
-
+        with Connection.get_instance():
             if (db_instance is not None):
                 Instance._ensure_db_class(cls, db_instance)
 
                 _return = KeyStore(db_instance)
+
                 if (not _return.is_valid): _return = None
+                elif (cache): KeyStore._cache_db_instance(db_instance)
             #
         #
 
         return _return
     #
 
+    @staticmethod
+    def _on_after_transaction_end(session, transaction):
+        """
+sqlalchemy.org: Execute when the span of a SessionTransaction ends.
+
+:since: v1.0.0
+        """
+
+        if (transaction.parent is None):
+            invalidations = session.info.pop("pas_database_key_store_invalidations", None)
+
+            if (invalidations is not None):
+                for _id, key in invalidations: KeyStore._invalidate_cache(_id, key)
+            #
+        #
+    #
+
+    @classmethod
+    def bulk_insert(cls, rows, upsert_keys = None, batch_size = 1000):
+        """
+Inserts the given rows with multi-row statements within one transaction.
+Cached entries of upserted rows are removed after the changes are committed.
+
+:param cls: Encapsulating database instance class
+:param rows: Iterable of dicts with attribute values
+:param upsert_keys: List of unique column names identifying conflicting rows
+:param batch_size: Number of rows sent per statement
+
+:return: (int) Number of rows given
+:since:  v1.0.0
+        """
+
+        if (upsert_keys is None or (not KeyStore._is_cache_enabled())): return super(KeyStore, cls).bulk_insert(rows, upsert_keys, batch_size)
+
+        with Connection.get_instance() as connection:
+            return super(KeyStore, cls).bulk_insert(KeyStore._get_invalidated_rows(connection.get_session(), rows),
+                                                    upsert_keys,
+                                                    batch_size
+                                                   )
+        #
+    #
+
+    @classmethod
+    def _get_bulk_insert_values(cls, row):
+        """
+Returns the column values to be inserted for the given row.
+
+:param cls: Encapsulating database instance class
+:param row: Dict with attribute values
+
+:return: (dict) Column values
+:since:  v1.0.0
+        """
+
+        row = row.copy()
+
+        if ("key" in row): row['key'] = Binary.utf8(row['key'])
+        if (isinstance(row.get("value"), Mapping)): row['value'] = Binary.utf8(JsonResource().data_to_json(row['value']))
+
+        return super(KeyStore, cls)._get_bulk_insert_values(row)
+    #
+
     @classmethod
     def load_id(cls, _id):
         """
@@ -265,7 +626,14 @@ Load KeyStore value by ID.
 
         if (_id is None): raise NothingMatchedException("KeyStore ID is invalid")
 
-        with Connection.get_instance(): _return = KeyStore._load(cls, Instance.get_db_class_query(cls).get(_id))
+        with ReadOnlyContext() as connection:
+            db_instance = KeyStore._get_cached_db_instance(connection, _id = _id)
+
+            _return = (KeyStore._load(cls, Instance.get_db_class_query(cls).options(undefer(_DbKeyStore.value)).get(_id), True)
+                       if (db_instance is None) else
+                       KeyStore._load(cls, db_instance)
+                      )
+        #
 
         if (_return is None): raise NothingMatchedException("KeyStore ID '{0}' not found".format(_id))
         return _return
@@ -285,10 +653,15 @@ Load KeyStore value by key.
 
         if (key is None): raise NothingMatchedException("KeyStore key is invalid")
 
-        with Connection.get_instance():
-            _return = KeyStore._load(cls,
-                                     Instance.get_db_class_query(cls).filter(_DbKeyStore.key == key).first()
-                                    )
+        with ReadOnlyContext() as connection:
+            db_instance = KeyStore._get_cached_db_instance(connection, key = key)
+
+            db_query = Instance.get_db_class_query(cls).options(undefer(_DbKeyStore.value)).filter(_DbKeyStore.key == key)
+
+            _return = (KeyStore._load(cls, db_query.first(), True)
+                       if (db_instance is None) else
+                       KeyStore._load(cls, db_instance)
+                      )
         #
 
         if (_return is None): raise NothingMatchedException("KeyStore key '{0}' not found".format(key))
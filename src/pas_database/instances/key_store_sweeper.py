@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;database
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;mpl2
+----------------------------------------------------------------------------
+#echo(pasDatabaseVersion)#
+#echo(__FILEPATH__)#
+"""
+
+# pylint: disable=import-error, no-name-in-module
+
+from threading import Event, Thread
+
+from dpt_logging import LogLine
+from dpt_settings import Settings
+from dpt_threading.instance_lock import InstanceLock
+
+from .key_store import KeyStore
+
+class KeyStoreSweeper(Thread):
+    """
+"KeyStoreSweeper" deletes expired KeyStore entries in bounded batches on a
+configurable interval in the background.
+
+:author:     direct Netware Group et al.
+:copyright:  (C) direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: database
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;mpl2
+             Mozilla Public License, v. 2.0
+    """
+
+    _instance = None
+    """
+KeyStoreSweeper singleton
+    """
+    _instance_lock = InstanceLock()
+    """
+Thread safety lock
+    """
+
+    def __init__(self, interval = None, batch_size = None, batches_max = None):
+        """
+Constructor __init__(KeyStoreSweeper)
+
+:param interval: Seconds between two sweeps
+:param batch_size: Number of entries deleted per batch
+:param batches_max: Maximum number of batches per sweep
+
+:since: v1.0.0
+        """
+
+        Thread.__init__(self, name = "pas.database.KeyStoreSweeper")
+        self.daemon = True
+
+        self.batch_size = (Settings.get("pas_database_key_store_sweep_batch_size", 1000) if (batch_size is None) else batch_size)
+        """
+Number of entries deleted per batch
+        """
+        self.batches_max = (Settings.get("pas_database_key_store_sweep_batches_max") if (batches_max is None) else batches_max)
+        """
+Maximum number of batches per sweep
+        """
+        self.interval = (Settings.get("pas_database_key_store_sweep_interval", 300) if (interval is None) else interval)
+        """
+Seconds between two sweeps
+        """
+        self._stop_event = Event()
+        """
+Event set to stop the sweeper
+        """
+    #
+
+    def run(self):
+        """
+python.org: Method representing the thread's activity.
+
+:since: v1.0.0
+        """
+
+        # pylint: disable=broad-except
+
+        while (not self._stop_event.wait(self.interval)):
+            try:
+                deleted = KeyStore.delete_expired(self.batch_size, self.batches_max)
+                if (deleted > 0): LogLine.debug("pas.database KeyStoreSweeper deleted {0:d} expired entries".format(deleted), context = "pas_database")
+            except Exception as handled_exception: LogLine.error(handled_exception, context = "pas_database")
+        #
+    #
+
+    def stop(self):
+        """
+Stops the sweeper after the current sweep.
+
+:since: v1.0.0
+        """
+
+        self._stop_event.set()
+    #
+
+    @staticmethod
+    def start_instance():
+        """
+Starts the KeyStoreSweeper singleton if it is not running already.
+
+:return: (object) KeyStoreSweeper instance
+:since:  v1.0.0
+        """
+
+        with KeyStoreSweeper._instance_lock:
+            if (KeyStoreSweeper._instance is None or (not KeyStoreSweeper._instance.is_alive())):
+                KeyStoreSweeper._instance = KeyStoreSweeper()
+                KeyStoreSweeper._instance.start()
+            #
+
+            return KeyStoreSweeper._instance
+        #
+    #
+
+    @staticmethod
+    def stop_instance():
+        """
+Stops the KeyStoreSweeper singleton if it is running.
+
+:since: v1.0.0
+        """
+
+        with KeyStoreSweeper._instance_lock:
+            if (KeyStoreSweeper._instance is not None):
+                KeyStoreSweeper._instance.stop()
+                KeyStoreSweeper._instance = None
+            #
+        #
+    #
+#
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;database
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;mpl2
+----------------------------------------------------------------------------
+#echo(pasDatabaseVersion)#
+#echo(__FILEPATH__)#
+"""
+
+from collections import OrderedDict
+from time import time
+
+from dpt_threading.thread_lock import ThreadLock
+
+class LruCache(object):
+    """
+"LruCache" is a thread-safe in-process cache evicting the least recently
+used entries if the size limit is reached. Entries expire after a TTL or at
+an explicitly given time.
+
+:author:     direct Netware Group et al.
+:copyright:  (C) direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: database
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;mpl2
+             Mozilla Public License, v. 2.0
+    """
+
+    __slots__ = [ "_entries", "hits", "_lock", "max_size", "misses", "ttl" ]
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    def __init__(self, max_size, ttl = None):
+        """
+Constructor __init__(LruCache)
+
+:param max_size: Maximum number of entries
+:param ttl: Time to live in seconds; None for no limit
+
+:since: v1.0.0
+        """
+
+        self._entries = OrderedDict()
+        """
+Cached entries with their expiry time
+        """
+        self.hits = 0
+        """
+Number of cache hits
+        """
+        self._lock = ThreadLock()
+        """
+Thread safety lock
+        """
+        self.max_size = max_size
+        """
+Maximum number of entries
+        """
+        self.misses = 0
+        """
+Number of cache misses
+        """
+        self.ttl = ttl
+        """
+Time to live in seconds
+        """
+    #
+
+    def __len__(self):
+        """
+python.org: Called to implement the built-in function len().
+
+:return: (int) Number of cached entries
+:since: v1.0.0
+        """
+
+        return len(self._entries)
+    #
+
+    @property
+    def statistics(self):
+        """
+Returns the cache statistics.
+
+:return: (dict) Cache statistics
+:since:  v1.0.0
+        """
+
+        with self._lock:
+            return { "hits": self.hits, "misses": self.misses, "size": len(self._entries), "max_size": self.max_size }
+        #
+    #
+
+    def clear(self):
+        """
+Clears all cached entries and statistics.
+
+:since: v1.0.0
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+        #
+    #
+
+    def get(self, key, default = None):
+        """
+Returns the cached value for the given key.
+
+:param key: Cache key
+:param default: Value returned if the key is not cached or expired
+
+:return: (mixed) Cached value
+:since:  v1.0.0
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if (entry is not None and entry[1] is not None and entry[1] <= time()):
+                del self._entries[key]
+                entry = None
+            #
+
+            if (entry is None):
+                self.misses += 1
+                _return = default
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+
+                _return = entry[0]
+            #
+        #
+
+        return _return
+    #
+
+    def remove(self, key):
+        """
+Removes the given key from the cache.
+
+:param key: Cache key
+
+:return: (mixed) Removed value; None if not cached
+:since:  v1.0.0
+        """
+
+        with self._lock: entry = self._entries.pop(key, None)
+        return (None if (entry is None) else entry[0])
+    #
+
+    def set(self, key, value, expires = None):
+        """
+Caches the given value.
+
+:param key: Cache key
+:param value: Value to be cached
+:param expires: UNIX timestamp the entry expires at; the TTL is applied if it
+                expires earlier
+
+:since: v1.0.0
+        """
+
+        if (self.ttl is not None):
+            ttl_expires = time() + self.ttl
+            if (expires is None or ttl_expires < expires): expires = ttl_expires
+        #
+
+        with self._lock:
+            self._entries[key] = ( value, expires )
+            self._entries.move_to_end(key)
+
+            while (len(self._entries) > self.max_size): self._entries.popitem(last = False)
+        #
+    #
+#
@@ -19,6 +19,7 @@ https://www.direct-netware.de/redirect?licenses;mpl2
 
 from uuid import uuid4 as uuid
 
+from sqlalchemy.orm import deferred
 from sqlalchemy.schema import Column
 from sqlalchemy.types import TEXT, VARCHAR
 
@@ -74,9 +75,9 @@ keystore.validity_start_time
     """
 keystore.validity_end_time
     """
-    value = Column(TEXT)
+    value = deferred(Column(TEXT))
     """
-keystore.value
+keystore.value (loaded on first access if not requested explicitly)
     """
 
     def __init__(self, *args, **kwargs):
@@ -20,8 +20,10 @@ https://www.direct-netware.de/redirect?licenses;mpl2
 from time import time
 from uuid import uuid4 as uuid
 
+from sqlalchemy.orm import deferred
 from sqlalchemy.schema import Column
-from sqlalchemy.types import BIGINT, VARCHAR
+from sqlalchemy.sql.expression import text
+from sqlalchemy.types import BIGINT, TEXT, VARCHAR
 
 from .abstract import Abstract
 from ..types import DateTime
@@ -54,7 +56,7 @@ SQLAlchemy table name
     """
 Encapsulating SQLAlchemy database instance class name
     """
-    db_schema_version = 1
+    db_schema_version = 2
     """
 Database schema version
     """
@@ -75,6 +77,11 @@ schema_version.version
     """
 schema_version.applied
     """
+    checkpoint = deferred(Column(TEXT, server_default = text("NULL")))
+    """
+schema_version.checkpoint (JSON encoded last key of a batched migration;
+omitted on insert to be compatible with tables not upgraded yet)
+    """
 
     def __init__(self, *args, **kwargs):
         """
@@ -17,6 +17,8 @@ https://www.direct-netware.de/redirect?licenses;mpl2
 #echo(__FILEPATH__)#
 """
 
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from hashlib import sha1
 from os import path
 import os
 import re
@@ -31,11 +33,15 @@ from dpt_runtime.io_exception import IOException
 from dpt_runtime.type_exception import TypeException
 from dpt_settings import Settings
 
+from sqlalchemy.sql.expression import column, func, select, table, text
+
 from .connection import Connection
+from .explain import Explain
 from .instance import Instance
 from .nothing_matched_exception import NothingMatchedException
 from .orm import Abstract as _DbAbstract
 from .orm.schema_version import SchemaVersion as _DbSchemaVersion
+from .sql_script_parser import SqlScriptParser
 from .transaction_context import TransactionContext
 
 class Schema(Instance):
@@ -51,17 +57,26 @@ The "Schema" class provides methods to handle versions and upgrades.
              Mozilla Public License, v. 2.0
     """
 
-    _DB_INSTANCE_CLASS = _DbSchemaVersion
+    DML_STATEMENTS = ( "DELETE", "INSERT", "SELECT", "UPDATE" )
     """
-SQLAlchemy database instance class to initialize for new instances.
+SQL statement types estimated with "EXPLAIN"
+    """
+    MIGRATION_NAME_PREFIX = "pas_database.Migration."
+    """
+Schema name prefix of entries recording checkpoints of batched migrations
+    """
+    RE_SQL_TABLE_NAMES = re.compile("(?:ALTER\\s+TABLE|DELETE\\s+FROM|DROP\\s+TABLE|FROM|INSERT\\s+INTO|JOIN|UPDATE)\\s+(?:IF\\s+EXISTS\\s+)?(?:ONLY\\s+)?\"?([\\w.]+)\"?", re.I)
     """
-    RE_ESCAPED = re.compile("(\\\\+)$")
+RegExp to find table names referenced by a SQL statement
     """
-RegExp to find escape characters
+    _DB_INSTANCE_CLASS = _DbSchemaVersion
+    """
+SQLAlchemy database instance class to initialize for new instances.
     """
-    RE_SQL_COMMENT_LINE = re.compile("^\\s*\\-\\-.*$", re.M)
+    STATE_NAME_PREFIX = "pas_database.SchemaState."
     """
-Comments in (invalid) JSON setting files are replaced before getting parsed.
+Schema name prefix of entries recording that a set of instance classes is
+at its target versions
     """
 
     __slots__ = [ ]
@@ -95,116 +110,299 @@ class.
 :since: v1.0.0
         """
 
-        # pylint: disable=broad-except
-
         if (instance_class is None
             or (not issubclass(instance_class, _DbAbstract))
             or instance_class.db_schema_version is None
            ): raise TypeException("Given instance class is invalid")
 
         current_version = 0
+
+        try:
+            schema_version = Schema.load_latest_name_entry(instance_class.__name__)
+            current_version = schema_version['version']
+        except NothingMatchedException: pass
+
+        Schema._apply_version(instance_class, current_version)
+    #
+
+    @staticmethod
+    def _apply_version(instance_class, current_version, schema_version_files = None):
+        """
+Applies all changed schema version files required for the given instance
+class based on the given current version.
+
+:param instance_class: Database instance class
+:param current_version: Current schema version
+:param schema_version_files: Database schema version files; None to list
+                             them
+
+:since: v1.0.0
+        """
+
         instance_class_name = instance_class.__name__
 
         with Connection.get_instance():
-            try:
-                schema_version = Schema.load_latest_name_entry(instance_class_name)
-                current_version = schema_version['version']
-            except NothingMatchedException: pass
-
             target_version = instance_class.db_schema_version
 
             with HookContext("pas.database.{0}.applySchema".format(instance_class_name),
                              current_version = current_version,
                              target_version = target_version
                             ):
-                schema_directory_path = path.join(Settings.get("path_data"),
-                                                "database",
-                                                "{0}_schema".format(Connection.get_backend_name()),
-                                                instance_class_name
-                                                )
-
-                schema_version_files = { }
-
-                if (os.access(schema_directory_path, os.R_OK | os.X_OK)):
-                    re_object = re.compile("schema\\_\\d+\\.(json|sql)$", re.I)
-
-                    schema_version_files = { file_name: path.join(schema_directory_path, file_name)
-                                            for file_name in os.listdir(schema_directory_path) if (re_object.match(file_name) is not None)
-                                        }
-                #
-
                 if (current_version < 1):
                     LogLine.info("pas.Database schema '{0}' is at version {1:d}".format(instance_class_name, target_version))
 
                     schema = Schema()
                     schema.set_data_attributes(name = instance_class_name, version = target_version)
                     schema.save()
-                elif (len(schema_version_files) > 0
-                    and current_version < target_version
-                    ): Schema._upgrade(instance_class_name, schema_version_files, current_version, target_version)
+                elif (current_version < target_version):
+                    if (schema_version_files is None): schema_version_files = Schema._get_schema_version_files(instance_class)
+
+                    if (len(schema_version_files) > 0):
+                        Schema._upgrade(instance_class_name, schema_version_files, current_version, target_version, instance_class)
+                    #
+                #
             #
         #
     #
 
     @staticmethod
-    def _apply_sql_command(sql_command):
+    def apply_versions(instance_classes, workers = None):
         """
-Applies the given SQL command to the database connection.
+Applies all changed schema version files required for the given instance
+classes. Current versions are loaded with one query. Upgrades of classes not
+depending on each other are applied concurrently with separate connections
+if access is not serialized.
 
-:param sql_command: Database specific SQL command
+:param instance_classes: List of database instance classes
+:param workers: Number of concurrent upgrades; None for the configured one
 
 :since: v1.0.0
         """
 
-        Connection.get_instance().get_bind().execute(sql_command)
+        instance_classes = { instance_class.__name__: instance_class for instance_class in instance_classes }
+
+        for instance_class in instance_classes.values():
+            if (not issubclass(instance_class, _DbAbstract)
+                or instance_class.db_schema_version is None
+               ): raise TypeException("Given instance class is invalid")
+        #
+
+        if (Schema.is_current(instance_classes.values())): return
+
+        if (workers is None): workers = Settings.get("pas_database_schema_workers", 4)
+        if (Connection.is_serialized()): workers = 1
+
+        current_versions = Schema.load_latest_versions()
+        dependencies = { }
+        schema_version_files = { }
+
+        with Connection.get_instance():
+            for instance_class_name, instance_class in instance_classes.items():
+                current_version = current_versions.get(instance_class_name, 0)
+                dependencies[instance_class_name] = set()
+
+                if (0 < current_version < instance_class.db_schema_version):
+                    schema_version_files[instance_class_name] = Schema._get_schema_version_files(instance_class)
+
+                    dependencies[instance_class_name].update(Schema._get_upgrade_dependency_names(instance_class_name,
+                                                                                                  schema_version_files[instance_class_name],
+                                                                                                  current_version,
+                                                                                                  instance_class.db_schema_version
+                                                                                                 ))
+                #
+            #
+        #
+
+        for instance_class_name in dependencies:
+            dependencies[instance_class_name].intersection_update(instance_classes)
+            dependencies[instance_class_name].discard(instance_class_name)
+        #
+
+        apply_version = lambda instance_class_name: Schema._apply_version(instance_classes[instance_class_name],
+                                                                          current_versions.get(instance_class_name, 0),
+                                                                          schema_version_files.get(instance_class_name)
+                                                                         )
+
+        completed = set()
+
+        if (workers < 2):
+            while (len(dependencies) > 0):
+                instance_class_name = Schema._get_next_ready_name(dependencies, completed)
+                del dependencies[instance_class_name]
+
+                apply_version(instance_class_name)
+                completed.add(instance_class_name)
+            #
+        else:
+            with ThreadPoolExecutor(max_workers = workers) as executor:
+                futures = { }
+
+                while (len(dependencies) > 0 or len(futures) > 0):
+                    ready_names = [ instance_class_name
+                                    for instance_class_name, instance_class_dependencies in dependencies.items()
+                                    if (instance_class_dependencies.issubset(completed))
+                                  ]
+
+                    # Cyclic dependencies are checked again by "_upgrade()"
+                    if (len(ready_names) < 1 and len(futures) < 1): ready_names.append(Schema._get_next_ready_name(dependencies, completed))
+
+                    for instance_class_name in ready_names:
+                        del dependencies[instance_class_name]
+                        futures[executor.submit(apply_version, instance_class_name)] = instance_class_name
+                    #
+
+                    done_futures, _ = wait(futures, return_when = FIRST_COMPLETED)
+
+                    for future in done_futures:
+                        completed.add(futures.pop(future))
+                        future.result()
+                    #
+                #
+            #
+        #
+
+        current_versions = Schema.load_latest_versions()
+
+        # Upgrades stopped because of missing dependencies are retried next time
+        if (all(current_versions.get(instance_class_name, 0) >= instance_class.db_schema_version
+                for instance_class_name, instance_class in instance_classes.items()
+               )): Schema._save_state(instance_classes.values())
     #
 
     @staticmethod
-    def _apply_sql_file(file_path_name):
+    def _apply_migration(name, migration, batches, checkpoint, db_class = None):
         """
-Applies the given SQL file.
+Applies the given migration in batches. Each batch is committed together
+with its checkpoint.
 
-:param file_path_name: Database specific SQL file
+:param name: Schema name of the checkpoint entry
+:param migration: Migration definition
+:param batches: Number of batches already applied
+:param checkpoint: JSON encoded key of the last entry migrated; None to
+                   start with the first one
+:param db_class: SQLAlchemy database class used to select the engine
 
 :since: v1.0.0
         """
 
-        file_content = None
-        file_object = File()
+        connection = Connection.get_instance()
+        table_prefix = _DbAbstract.get_table_prefix()
+
+        batch_size = int(migration.get("batch_size", Settings.get("pas_database_migration_batch_size", 10000)))
+        key_column = column(migration['key'])
+        last_key = (None if (checkpoint is None) else JsonResource.json_to_data(checkpoint))
+        source_table = table(migration['table'].replace("__db_prefix__", table_prefix), key_column)
 
-        if (file_object.open(file_path_name, True, "r")):
-            file_content = Binary.str(file_object.read())
-            file_object.close()
+        with connection:
+            quoted_key = connection.get_bind(db_class).dialect.identifier_preparer.quote(migration['key'])
         #
 
-        if (file_content is None): raise IOException("Schema file given is invalid")
+        LogLine.info("pas.Database applies migration '{0}' in batches of {1:d} entries".format(name, batch_size))
 
-        file_content = file_content.replace("__db_prefix__", _DbAbstract.get_table_prefix())
-        file_content = Schema.RE_SQL_COMMENT_LINE.sub("", file_content)
+        while (True):
+            with TransactionContext():
+                condition = (None if (last_key is None) else key_column > last_key)
 
-        current_sql_command = ""
-        sql_commands = file_content.split(";")
+                db_query = select([ key_column ]).select_from(source_table).order_by(key_column).limit(1).offset(batch_size - 1)
+                if (condition is not None): db_query = db_query.where(condition)
 
-        for sql_command in sql_commands:
-            re_result = Schema.RE_ESCAPED.search(sql_command)
+                batch_last_key = connection.execute(db_query, mapper = db_class).scalar()
 
-            if (re_result is not None
-                and (len(re_result.group(1)) % 2) == 1
-               ): current_sql_command += sql_command
-            else:
-                current_sql_command = (sql_command
-                                       if (current_sql_command == "") else
-                                       current_sql_command + sql_command
-                                      )
+                if (batch_last_key is None):
+                    # Last (incomplete) batch
+                    db_query = select([ func.max(key_column) ]).select_from(source_table)
+                    if (condition is not None): db_query = db_query.where(condition)
 
-                current_sql_command = current_sql_command.strip()
+                    batch_last_key = connection.execute(db_query, mapper = db_class).scalar()
+                #
+
+                if (batch_last_key is None):
+                    for sql_command in migration.get("finish_sql", [ ]):
+                        connection.execute(text(sql_command.replace("__db_prefix__", table_prefix)), mapper = db_class)
+                    #
 
-                if (current_sql_command != ""):
-                    Schema._apply_sql_command(current_sql_command)
-                    current_sql_command = ""
+                    connection.query(_DbSchemaVersion).filter(_DbSchemaVersion.name == name).update({ _DbSchemaVersion.version: -1 },
+                                                                                                    synchronize_session = False
+                                                                                                   )
+
+                    break
                 #
+
+                batch_condition = ("{0} <= :batch_last_key".format(quoted_key)
+                                   if (last_key is None) else
+                                   "{0} > :last_key AND {0} <= :batch_last_key".format(quoted_key)
+                                  )
+
+                sql_command = migration['sql'].replace("__db_prefix__", table_prefix).replace("__batch_condition__", batch_condition)
+
+                connection.execute(text(sql_command),
+                                   { "last_key": last_key, "batch_last_key": batch_last_key },
+                                   mapper = db_class
+                                  )
+
+                batches += 1
+                last_key = batch_last_key
+
+                connection.query(_DbSchemaVersion).filter(_DbSchemaVersion.name == name).update({ _DbSchemaVersion.version: batches,
+                                                                                                  _DbSchemaVersion.checkpoint: JsonResource().data_to_json(last_key)
+                                                                                                },
+                                                                                                synchronize_session = False
+                                                                                               )
             #
         #
+
+        LogLine.info("pas.Database completed migration '{0}' with {1:d} batches".format(name, batches))
+    #
+
+    @staticmethod
+    def _apply_sql_command(sql_command, db_class = None):
+        """
+Applies the given SQL command to the database connection of the active
+session transaction.
+
+:param sql_command: Database specific SQL command
+:param db_class: SQLAlchemy database class used to select the engine
+
+:since: v1.0.0
+        """
+
+        sa_connection = Connection.get_instance().connection(mapper = db_class)
+
+        # SQLAlchemy 1.4 expects raw SQL to be passed to "exec_driver_sql()"
+        if (hasattr(sa_connection, "exec_driver_sql")): sa_connection.exec_driver_sql(sql_command)
+        else: sa_connection.execute(sql_command)
+    #
+
+    @staticmethod
+    def _apply_sql_file(file_path_name, db_class = None):
+        """
+Applies the given SQL file within the active session transaction.
+Statements are executed while the file is read. Adjacent statements are sent
+in batches to backends supporting it if configured.
+
+:param file_path_name: Database specific SQL file
+:param db_class: SQLAlchemy database class used to select the engine
+
+:since: v1.0.0
+        """
+
+        batch_size = (Settings.get("pas_database_schema_sql_batch_size", 1)
+                      if (Connection.get_instance().get_bind(db_class).dialect.name == "postgresql") else
+                      1
+                     )
+
+        batch = [ ]
+
+        for sql_command in Schema._read_sql_file(file_path_name):
+            batch.append(sql_command)
+
+            if (len(batch) >= batch_size):
+                Schema._apply_sql_command(";\n".join(batch), db_class)
+                batch = [ ]
+            #
+        #
+
+        if (len(batch) > 0): Schema._apply_sql_command(";\n".join(batch), db_class)
     #
 
     @staticmethod
@@ -237,6 +435,307 @@ Checks that all dependencies are matched.
         return _return
     #
 
+    @staticmethod
+    def _get_estimated_sql_command(sa_connection, sql_command):
+        """
+Returns the estimate of the given SQL command without executing it. DML
+statements are explained on PostgreSQL and SQLite. Rows of referenced tables
+are estimated based on the table statistics.
+
+:param sa_connection: SQLAlchemy connection
+:param sql_command: Database specific SQL command
+
+:return: (dict) Statement type, SQL command, estimated rows of referenced
+         tables and the query plan with its estimated rows if available
+:since:  v1.0.0
+        """
+
+        # pylint: disable=broad-except
+
+        dialect_name = sa_connection.dialect.name
+        statement_type = sql_command.split(None, 1)[0].upper()
+
+        _return = { "type": statement_type,
+                    "sql": sql_command,
+                    "tables": { table_name: Schema._get_estimated_table_rows(sa_connection, table_name)
+                                for table_name in set(Schema.RE_SQL_TABLE_NAMES.findall(sql_command))
+                              },
+                    "plan": None,
+                    "plan_rows": None
+                  }
+
+        if (statement_type in Schema.DML_STATEMENTS and dialect_name in ( "postgresql", "sqlite" )):
+            transaction = sa_connection.begin()
+
+            try:
+                if (dialect_name == "postgresql"):
+                    query_plan = sa_connection.execute(Explain(text(sql_command))).scalar()
+                    if (isinstance(query_plan, str)): query_plan = JsonResource.json_to_data(query_plan)
+
+                    if (type(query_plan) is list and len(query_plan) > 0):
+                        _return['plan'] = query_plan[0]['Plan']
+                        _return['plan_rows'] = int(query_plan[0]['Plan']['Plan Rows'])
+                    #
+                else:
+                    _return['plan'] = [ row[-1] for row in sa_connection.execute(Explain(text(sql_command))) ]
+
+                    table_rows = [ rows for rows in _return['tables'].values() if rows is not None ]
+                    if (len(table_rows) > 0): _return['plan_rows'] = max(table_rows)
+                #
+            except Exception as handled_exception:
+                # Tables created by previous statements of the upgrade are not available
+                _return['plan'] = "{0!r}".format(handled_exception)
+            finally: transaction.rollback()
+        #
+
+        return _return
+    #
+
+    @staticmethod
+    def _get_estimated_table_rows(sa_connection, table_name):
+        """
+Returns the number of rows of the given table estimated by the database
+statistics.
+
+:param sa_connection: SQLAlchemy connection
+:param table_name: Table name
+
+:return: (int) Estimated number of rows; None if not available
+:since:  v1.0.0
+        """
+
+        # pylint: disable=broad-except
+
+        _return = None
+
+        dialect_name = sa_connection.dialect.name
+
+        if (dialect_name in ( "postgresql", "sqlite" )):
+            transaction = sa_connection.begin()
+
+            try:
+                if (dialect_name == "postgresql"):
+                    reltuples = sa_connection.execute(text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table_name)"),
+                                                      { "table_name": table_name }
+                                                     ).scalar()
+
+                    # reltuples is negative (or zero on old versions) if never analyzed
+                    if (reltuples is not None and reltuples > 0): _return = int(reltuples)
+                else:
+                    # "sqlite_stat1" is only available after "ANALYZE" has been executed
+                    stat = sa_connection.execute(text("SELECT stat FROM sqlite_stat1 WHERE tbl = :table_name LIMIT 1"),
+                                                 { "table_name": table_name }
+                                                ).scalar()
+
+                    if (stat is not None): _return = int(stat.split(" ", 1)[0])
+                #
+            except Exception: pass
+            finally: transaction.rollback()
+        #
+
+        return _return
+    #
+
+    @staticmethod
+    def _get_next_ready_name(dependencies, completed):
+        """
+Returns the next name without pending dependencies. The first one is
+returned if all have pending (cyclic) dependencies.
+
+:param dependencies: Dict of names with their dependency names
+:param completed: Set of names already completed
+
+:return: (str) Name
+:since:  v1.0.0
+        """
+
+        _return = None
+
+        for name, name_dependencies in dependencies.items():
+            if (name_dependencies.issubset(completed)):
+                _return = name
+                break
+            #
+        #
+
+        if (_return is None): _return = next(iter(dependencies))
+
+        return _return
+    #
+
+    @staticmethod
+    def _get_schema_version_files(instance_class):
+        """
+Returns the database schema version files of the given instance class for
+the database backend used.
+
+:param instance_class: Database instance class
+
+:return: (dict) Dict of file names and their paths
+:since:  v1.0.0
+        """
+
+        _return = { }
+
+        schema_directory_path = path.join(Settings.get("path_data"),
+                                          "database",
+                                          "{0}_schema".format(Connection.get_instance().get_bind(instance_class).dialect.name),
+                                          instance_class.__name__
+                                         )
+
+        if (os.access(schema_directory_path, os.R_OK | os.X_OK)):
+            re_object = re.compile("schema\\_\\d+\\.(json|sql)$", re.I)
+
+            _return = { file_name: path.join(schema_directory_path, file_name)
+                        for file_name in os.listdir(schema_directory_path) if (re_object.match(file_name) is not None)
+                      }
+        #
+
+        return _return
+    #
+
+    @staticmethod
+    def _get_state_entry(instance_classes):
+        """
+Returns the schema name and version of the entry recording that the given
+instance classes are at their target versions. The name identifies the set
+of instance classes and the version is a fingerprint of their target
+versions.
+
+:param instance_classes: List of database instance classes
+
+:return: (tuple) Schema name and version
+:since:  v1.0.0
+        """
+
+        instance_classes = sorted(instance_classes, key = lambda instance_class: instance_class.__name__)
+
+        name_hash = sha1(",".join(instance_class.__name__ for instance_class in instance_classes).encode("utf-8"))
+
+        version_hash = sha1(",".join("{0}={1:d}".format(instance_class.__name__, instance_class.db_schema_version)
+                                     for instance_class in instance_classes
+                                    ).encode("utf-8"))
+
+        # The version is stored as a signed 64 bit integer
+        return ( "{0}{1}".format(Schema.STATE_NAME_PREFIX, name_hash.hexdigest()[:32]),
+                 int(version_hash.hexdigest()[:15], 16)
+               )
+    #
+
+    @staticmethod
+    def get_upgrade_plan(instance_classes):
+        """
+Returns the pending schema upgrades of the given instance classes without
+applying them. Each statement of pending schema files is parsed and
+estimated.
+
+:param instance_classes: List of database instance classes
+
+:return: (list) List of dicts with the schema name, its current and target
+         version and the estimated statements of each pending version
+:since:  v1.0.0
+        """
+
+        # pylint: disable=broad-except
+
+        _return = [ ]
+
+        try: current_versions = Schema.load_latest_versions()
+        except Exception: current_versions = { }
+
+        with Connection.get_instance() as connection:
+            for instance_class in sorted(instance_classes, key = lambda instance_class: instance_class.__name__):
+                instance_class_name = instance_class.__name__
+                current_version = current_versions.get(instance_class_name, 0)
+
+                schema_plan = { "name": instance_class_name,
+                                "current_version": current_version,
+                                "target_version": instance_class.db_schema_version,
+                                "versions": [ ]
+                              }
+
+                if (0 < current_version < instance_class.db_schema_version):
+                    schema_version_files = Schema._get_schema_version_files(instance_class)
+
+                    with connection.get_bind(instance_class).connect() as sa_connection:
+                        for schema_version in range(current_version + 1, instance_class.db_schema_version + 1):
+                            file_name = "schema_{0:d}.sql".format(schema_version)
+
+                            if (file_name in schema_version_files):
+                                statements = [ Schema._get_estimated_sql_command(sa_connection, sql_command)
+                                               for sql_command in Schema._read_sql_file(schema_version_files[file_name])
+                                             ]
+
+                                schema_plan['versions'].append({ "version": schema_version,
+                                                                 "file": schema_version_files[file_name],
+                                                                 "statements": statements
+                                                               })
+                            #
+                        #
+                    #
+                #
+
+                _return.append(schema_plan)
+            #
+        #
+
+        return _return
+    #
+
+    @staticmethod
+    def _get_upgrade_dependency_names(instance_class_name, schema_version_files, current_version, target_version):
+        """
+Returns the names of all schema dependencies of the pending upgrade.
+
+:param instance_class_name: SQLAlchemy database instance name the schema is
+       used for
+:param schema_version_files: List of database schema version files
+:param current_version: Current version of the SQLAlchemy database instance
+:param target_version: Target version of the SQLAlchemy database instance
+
+:return: (set) Schema names
+:since:  v1.0.0
+        """
+
+        _return = set()
+
+        for schema_version in range(current_version + 1, target_version + 1):
+            file_name = "schema_{0:d}.json".format(schema_version)
+
+            if (file_name in schema_version_files):
+                schema_data = Schema._load_schema_data(instance_class_name, schema_version, schema_version_files[file_name])
+
+                if (type(schema_data.get("dependencies")) is list):
+                    _return.update(dependency['name'] for dependency in schema_data['dependencies'] if ("name" in dependency))
+                #
+            #
+        #
+
+        return _return
+    #
+
+    @staticmethod
+    def is_current(instance_classes):
+        """
+Returns true if the given instance classes have been recorded to be at their
+target versions. Only one lookup is required.
+
+:param instance_classes: List of database instance classes
+
+:return: (bool) True if no schema upgrade is required
+:since:  v1.0.0
+        """
+
+        name, version = Schema._get_state_entry(instance_classes)
+
+        with Connection.get_instance() as connection:
+            db_query = connection.query(_DbSchemaVersion.id)
+            db_query = db_query.filter(_DbSchemaVersion.name == name, _DbSchemaVersion.version == version)
+
+            return (db_query.first() is not None)
+        #
+    #
+
     @classmethod
     def load_latest_name_entry(cls, name):
         """
@@ -262,7 +761,121 @@ Load the schema entry with the highest version for the given name.
     #
 
     @staticmethod
-    def _upgrade(instance_class_name, schema_version_files, current_version, target_version):
+    def load_latest_versions():
+        """
+Loads the highest version of all schema names with one query. Entries
+recording the schema state and migration checkpoints are ignored.
+
+:return: (dict) Dict of schema names and their versions
+:since:  v1.0.0
+        """
+
+        with Connection.get_instance() as connection:
+            db_query = connection.query(_DbSchemaVersion.name, func.max(_DbSchemaVersion.version))
+
+            db_query = db_query.filter(~_DbSchemaVersion.name.startswith(Schema.STATE_NAME_PREFIX, autoescape = True),
+                                       ~_DbSchemaVersion.name.startswith(Schema.MIGRATION_NAME_PREFIX, autoescape = True)
+                                      )
+
+            db_query = db_query.group_by(_DbSchemaVersion.name)
+
+            return { name: version for name, version in db_query }
+        #
+    #
+
+    @staticmethod
+    def _load_migration_checkpoints(name_prefix):
+        """
+Loads the checkpoints of all migrations with the given schema name prefix.
+
+:param name_prefix: Schema name prefix
+
+:return: (dict) Dict of migration names with the number of batches applied
+         (-1 if completed) and the JSON encoded last key migrated
+:since:  v1.0.0
+        """
+
+        with Connection.get_instance() as connection:
+            db_query = connection.query(_DbSchemaVersion.name, _DbSchemaVersion.version, _DbSchemaVersion.checkpoint)
+            db_query = db_query.filter(_DbSchemaVersion.name.startswith(name_prefix, autoescape = True))
+
+            return { name[len(name_prefix):]: ( version, checkpoint ) for name, version, checkpoint in db_query }
+        #
+    #
+
+    @staticmethod
+    def _load_schema_data(instance_class_name, schema_version, file_path_name):
+        """
+Loads the JSON encoded database schema settings file.
+
+:param instance_class_name: SQLAlchemy database instance name the schema is
+       used for
+:param schema_version: Schema version
+:param file_path_name: Database schema settings file
+
+:return: (dict) Database schema settings
+:since:  v1.0.0
+        """
+
+        schema_data_file = File()
+
+        try:
+            if (not schema_data_file.open(file_path_name, True, "r")):
+                raise IOException("An error occurred while reading database schema settings of '{0}' at version {1:d}".format(instance_class_name, schema_version))
+            #
+
+            _return = JsonResource.json_to_data(schema_data_file.read())
+            if (_return is None): raise IOException("'{0}' is not a valid JSON encoded file".format(file_path_name))
+        finally: schema_data_file.close()
+
+        return _return
+    #
+
+    @staticmethod
+    def _read_sql_file(file_path_name):
+        """
+Reads the given SQL file line by line and yields each statement found.
+
+:param file_path_name: Database specific SQL file
+
+:return: (object) SQL statement generator
+:since:  v1.0.0
+        """
+
+        file_object = File()
+
+        try:
+            if (not file_object.open(file_path_name, True, "r")): raise IOException("Schema file given is invalid")
+
+            for sql_command in SqlScriptParser(file_object.handle, { "__db_prefix__": _DbAbstract.get_table_prefix() }):
+                yield sql_command
+            #
+        finally: file_object.close()
+    #
+
+    @staticmethod
+    def _save_state(instance_classes):
+        """
+Records that the given instance classes are at their target versions.
+
+:param instance_classes: List of database instance classes
+
+:since: v1.0.0
+        """
+
+        name, version = Schema._get_state_entry(instance_classes)
+
+        with TransactionContext():
+            Connection.get_instance().query(_DbSchemaVersion).filter(_DbSchemaVersion.name == name).delete(synchronize_session = False)
+
+            schema = Schema()
+            schema.set_data_attributes(name = name, version = version)
+            schema.save()
+        #
+    #
+
+    @staticmethod
+    def _upgrade(instance_class_name, schema_version_files, current_version, target_version, db_class = None):
         """
 Upgrades the given database schema.
 
@@ -271,6 +884,7 @@ Upgrades the given database schema.
 :param schema_version_files: List of database schema version files
 :param current_version: Current version of the SQLAlchemy database instance
 :param target_version: Target version of the SQLAlchemy database instance
+:param db_class: SQLAlchemy database class used to select the engine
 
 :since: v1.0.0
         """
@@ -279,45 +893,47 @@ Upgrades the given database schema.
         schema_versions = (version for version in range(current_version + 1, target_version + 1) if "schema_{0:d}.sql".format(version) in schema_version_files)
 
         try:
-            with TransactionContext():
-                for schema_version in schema_versions:
-                    if ("schema_{0:d}.json".format(schema_version) in schema_version_files):
-                        schema_data_file = File()
-                        schema_data_path_file_name = schema_version_files["schema_{0:d}.json".format(schema_version)]
-
-                        try:
-                            if (not schema_data_file.open(schema_data_path_file_name, True, "r")):
-                                raise IOException("An error occurred while reading database schema settings of '{0}' at version {1:d}".format(instance_class_name, schema_version))
-                            #
-
-                            schema_raw_data = schema_data_file.read()
+            for schema_version in schema_versions:
+                migrations = None
 
-                            schema_data = JsonResource.json_to_data(schema_raw_data)
+                if ("schema_{0:d}.json".format(schema_version) in schema_version_files):
+                    schema_data = Schema._load_schema_data(instance_class_name,
+                                                           schema_version,
+                                                           schema_version_files["schema_{0:d}.json".format(schema_version)]
+                                                          )
 
-                            if (schema_data is None):
-                                raise IOException("'{0}' is not a valid JSON encoded file".format(schema_data_path_file_name))
-                            #
+                    if (type(schema_data.get("dependencies")) is list
+                        and (not Schema._check_upgrade_dependencies(schema_data['dependencies']))
+                       ):
+                        LogLine.warning("pas.Database stopped upgrade of schema '{0}' at version {1:d} because of missing dependencies".format(instance_class_name, schema_version, target_version))
 
-                            if (type(schema_data.get("dependencies")) is list
-                                and (not Schema._check_upgrade_dependencies(schema_data['dependencies']))
-                               ):
-                                LogLine.warning("pas.Database stopped upgrade of schema '{0}' at version {1:d} because of missing dependencies".format(instance_class_name, schema_version, target_version))
+                        cli = InteractiveCli.get_instance()
+                        if (isinstance(cli, InteractiveCli)): cli.output_info("Database schema '{0}' not completely upgraded because of missing dependencies. Execute again after dependencies are matched.".format(instance_class_name))
 
-                                cli = InteractiveCli.get_instance()
-                                if (isinstance(cli, InteractiveCli)): cli.output_info("Database schema '{0}' not completely upgraded because of missing dependencies. Execute again after dependencies are matched.".format(instance_class_name))
-
-                                break
-                            #
-                        finally: schema_data_file.close()
+                        break
                     #
 
-                    Schema._apply_sql_file(schema_version_files["schema_{0:d}.sql".format(schema_version)])
-                    LogLine.info("pas.Database schema '{0}' is at version {1:d}".format(instance_class_name, schema_version))
+                    if (type(schema_data.get("migrations")) is list): migrations = schema_data['migrations']
+                #
 
-                    schema = Schema()
-                    schema.set_data_attributes(name = instance_class_name, version = schema_version)
-                    schema.save()
+                if (migrations is None):
+                    with TransactionContext():
+                        Schema._apply_sql_file(schema_version_files["schema_{0:d}.sql".format(schema_version)], db_class)
+
+                        schema = Schema()
+                        schema.set_data_attributes(name = instance_class_name, version = schema_version)
+                        schema.save()
+                    #
+                else:
+                    Schema._upgrade_online(instance_class_name,
+                                           schema_version,
+                                           schema_version_files["schema_{0:d}.sql".format(schema_version)],
+                                           migrations,
+                                           db_class
+                                          )
                 #
+
+                LogLine.info("pas.Database schema '{0}' is at version {1:d}".format(instance_class_name, schema_version))
             #
         except Exception:
             cli = InteractiveCli.get_instance()
@@ -326,4 +942,59 @@ Upgrades the given database schema.
             raise
         #
     #
+
+    @staticmethod
+    def _upgrade_online(instance_class_name, schema_version, file_path_name, migrations, db_class = None):
+        """
+Upgrades the given database schema to the given version with batched data
+migrations. The schema file is applied first in the same transaction that
+records the migration checkpoints. Each migration commits its batches
+separately and records a checkpoint to resume after an interruption.
+
+:param instance_class_name: SQLAlchemy database instance name the schema is
+       used for
+:param schema_version: Target version of the SQLAlchemy database instance
+:param file_path_name: Database specific SQL file
+:param migrations: List of migration definitions
+:param db_class: SQLAlchemy database class used to select the engine
+
+:since: v1.0.0
+        """
+
+        for migration in migrations:
+            if (not isinstance(migration, dict)
+                or len({ "key", "name", "sql", "table" }.difference(migration)) > 0
+               ): raise IOException("Migration definition of schema '{0}' at version {1:d} is invalid".format(instance_class_name, schema_version))
+        #
+
+        name_prefix = "{0}{1}.{2:d}.".format(Schema.MIGRATION_NAME_PREFIX, instance_class_name, schema_version)
+        checkpoints = Schema._load_migration_checkpoints(name_prefix)
+
+        if (len(checkpoints) < 1):
+            with TransactionContext():
+                Schema._apply_sql_file(file_path_name, db_class)
+
+                for migration in migrations:
+                    schema = Schema()
+                    schema.set_data_attributes(name = name_prefix + migration['name'], version = 0)
+                    schema.save()
+
+                    checkpoints[migration['name']] = ( 0, None )
+                #
+            #
+        else: LogLine.info("pas.Database resumes migrations of schema '{0}' at version {1:d}".format(instance_class_name, schema_version))
+
+        for migration in migrations:
+            batches, checkpoint = checkpoints.get(migration['name'], ( 0, None ))
+            if (batches >= 0): Schema._apply_migration(name_prefix + migration['name'], migration, batches, checkpoint, db_class)
+        #
+
+        with TransactionContext():
+            Connection.get_instance().query(_DbSchemaVersion).filter(_DbSchemaVersion.name.startswith(name_prefix, autoescape = True)).delete(synchronize_session = False)
+
+            schema = Schema()
+            schema.set_data_attributes(name = instance_class_name, version = schema_version)
+            schema.save()
+        #
+    #
 #
@@ -17,9 +17,20 @@ https://www.direct-netware.de/redirect?licenses;mpl2
 #echo(__FILEPATH__)#
 """
 
+# pylint: disable=import-error, no-name-in-module
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+
+try: from collections.abc import Mapping
+except ImportError: from collections import Mapping
+
+from dpt_json import JsonResource
 from dpt_runtime.type_exception import TypeException
 from dpt_runtime.value_exception import ValueException
 
+from sqlalchemy.sql.expression import and_, or_
+
 class SortDefinition(object):
     """
 "SortDefinition" is an abstracted class to define instances of database sort
@@ -84,13 +95,8 @@ Applies the sort order to the given SQLAlchemy query instance.
 
         _return = query
 
-        is_get_db_column_available = hasattr(db_column_definition, "get_db_column")
-
         for sort_definition in self.sort_tuples:
-            column = (db_column_definition.get_db_column(sort_definition[0])
-                      if (is_get_db_column_available) else
-                      getattr(db_column_definition, sort_definition[0])
-                     )
+            column = SortDefinition._get_db_column(db_column_definition, sort_definition[0])
 
             _return = _return.order_by(column.asc()
                                        if (sort_definition[1] == SortDefinition.ASCENDING) else
@@ -101,6 +107,49 @@ Applies the sort order to the given SQLAlchemy query instance.
         return _return
     #
 
+    def apply_keyset(self, db_column_definition, query, cursor = None):
+        """
+Applies the sort order and a condition to only return entries after the
+one the given keyset cursor was created for (seek pagination). The last
+sort attribute should be unique (e.g. the ID) to define a total order and
+sort attribute values must not be NULL.
+
+:param db_column_definition: Database class or column definition
+:param query: SQLAlchemy query instance
+:param cursor: Keyset cursor returned by "get_keyset_cursor()"; None for the
+               first page
+
+:return: (object) Modified SQLAlchemy query instance
+:since:  v1.0.0
+        """
+
+        _return = self.apply(db_column_definition, query)
+
+        if (cursor is not None):
+            values = self._decode_keyset_cursor(cursor)
+            condition_clauses = [ ]
+
+            for position, sort_definition in enumerate(self.sort_tuples):
+                column = SortDefinition._get_db_column(db_column_definition, sort_definition[0])
+
+                equal_clauses = [ (SortDefinition._get_db_column(db_column_definition, self.sort_tuples[equal_position][0]) == values[equal_position])
+                                  for equal_position in range(0, position)
+                                ]
+
+                equal_clauses.append(column > values[position]
+                                     if (sort_definition[1] == SortDefinition.ASCENDING) else
+                                     column < values[position]
+                                    )
+
+                condition_clauses.append(and_(*equal_clauses))
+            #
+
+            _return = _return.filter(or_(*condition_clauses))
+        #
+
+        return _return
+    #
+
     def append(self, attribute, direction):
         """
 Appends a sort definition to the current list.
@@ -128,6 +177,48 @@ Clears the current list.
         self.sort_tuples = [ ]
     #
 
+    def _decode_keyset_cursor(self, cursor):
+        """
+Decodes the given keyset cursor and returns the sort attribute values.
+
+:param cursor: Keyset cursor
+
+:return: (list) Sort attribute values
+:since:  v1.0.0
+        """
+
+        try: data = JsonResource.json_to_data(urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8"))
+        except (BinasciiError, UnicodeError, ValueError): data = None
+
+        if (type(data) is not dict
+            or data.get("a") != [ sort_definition[0] for sort_definition in self.sort_tuples ]
+            or type(data.get("v")) is not list
+            or len(data['v']) != len(self.sort_tuples)
+           ): raise ValueException("Keyset cursor given is invalid")
+
+        return data['v']
+    #
+
+    def get_keyset_cursor(self, entry):
+        """
+Returns an opaque keyset cursor for the given entry to be used for
+"apply_keyset()" to return the following ones.
+
+:param entry: Last entry as a mapping (e.g. Instance) or database instance
+
+:return: (str) Keyset cursor
+:since:  v1.0.0
+        """
+
+        values = [ (entry[sort_definition[0]] if (isinstance(entry, Mapping)) else getattr(entry, sort_definition[0]))
+                   for sort_definition in self.sort_tuples
+                 ]
+
+        data = { "a": [ sort_definition[0] for sort_definition in self.sort_tuples ], "v": values }
+
+        return urlsafe_b64encode(JsonResource().data_to_json(data).encode("utf-8")).decode("ascii")
+    #
+
     def prepend(self, attribute, direction):
         """
 Prepends a sort definition to the current list.
@@ -145,6 +236,24 @@ Prepends a sort definition to the current list.
         return self
     #
 
+    @staticmethod
+    def _get_db_column(db_column_definition, name):
+        """
+Returns a column from the given definition.
+
+:param db_column_definition: Database class or column definition
+:param name: Column name
+
+:return: (object) Database instance column
+:since:  v1.0.0
+        """
+
+        return (db_column_definition.get_db_column(name)
+                if (hasattr(db_column_definition, "get_db_column")) else
+                getattr(db_column_definition, name)
+               )
+    #
+
     @staticmethod
     def validate_sort_direction(direction):
         """
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;database
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;mpl2
+----------------------------------------------------------------------------
+#echo(pasDatabaseVersion)#
+#echo(__FILEPATH__)#
+"""
+
+import re
+
+class SqlScriptParser(object):
+    """
+"SqlScriptParser" reads SQL statements line by line from a script. Quoted
+literals and identifiers, PostgreSQL dollar-quoted bodies and comments are
+handled so that only terminating semicolons split statements. A semicolon
+preceded by an odd number of backslashes does not terminate a statement.
+
+:author:     direct Netware Group et al.
+:copyright:  (C) direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: database
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;mpl2
+             Mozilla Public License, v. 2.0
+    """
+
+    RE_TOKEN = re.compile("--|/\\*|'|\"|\\$(?:[A-Za-z_][A-Za-z0-9_]*)?\\$|;")
+    """
+RegExp to find tokens changing the parser state
+    """
+    STATE_BLOCK_COMMENT = 1
+    """
+Parser is within a block comment
+    """
+    STATE_DEFAULT = 0
+    """
+Parser is within a SQL statement
+    """
+    STATE_QUOTED = 2
+    """
+Parser is within a quoted literal, identifier or dollar-quoted body
+    """
+
+    __slots__ = [ "_file_object", "_replacements" ]
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    def __init__(self, file_object, replacements = None):
+        """
+Constructor __init__(SqlScriptParser)
+
+:param file_object: Iterable file object returning lines of the SQL script
+:param replacements: Dict of placeholders replaced in each line
+
+:since: v1.0.0
+        """
+
+        self._file_object = file_object
+        """
+Iterable file object
+        """
+        self._replacements = ({ } if (replacements is None) else replacements)
+        """
+Dict of placeholders and their replacements
+        """
+    #
+
+    def __iter__(self):
+        """
+python.org: Return an iterator object.
+
+:return: (object) Iterator yielding SQL statements
+:since:  v1.0.0
+        """
+
+        state = SqlScriptParser.STATE_DEFAULT
+        statement_parts = [ ]
+        quote = None
+
+        for line in self._file_object:
+            for placeholder, replacement in self._replacements.items(): line = line.replace(placeholder, replacement)
+
+            position = 0
+            line_length = len(line)
+
+            while (position < line_length):
+                if (state == SqlScriptParser.STATE_BLOCK_COMMENT):
+                    end_position = line.find("*/", position)
+
+                    if (end_position < 0): position = line_length
+                    else:
+                        statement_parts.append(" ")
+
+                        position = end_position + 2
+                        state = SqlScriptParser.STATE_DEFAULT
+                    #
+                elif (state == SqlScriptParser.STATE_QUOTED):
+                    end_position = line.find(quote, position)
+
+                    if (end_position < 0):
+                        statement_parts.append(line[position:])
+                        position = line_length
+                    else:
+                        end_position += len(quote)
+                        statement_parts.append(line[position:end_position])
+
+                        position = end_position
+
+                        # Doubled quotes are escaped ones
+                        if (len(quote) > 1 or line[position:position + 1] != quote): state = SqlScriptParser.STATE_DEFAULT
+                        else:
+                            statement_parts.append(quote)
+                            position += 1
+                        #
+                    #
+                else:
+                    re_result = SqlScriptParser.RE_TOKEN.search(line, position)
+
+                    if (re_result is None):
+                        statement_parts.append(line[position:])
+                        position = line_length
+                    else:
+                        token = re_result.group(0)
+                        statement_parts.append(line[position:re_result.start()])
+
+                        position = re_result.end()
+
+                        if (token == "--"):
+                            statement_parts.append("\n")
+                            position = line_length
+                        elif (token == "/*"): state = SqlScriptParser.STATE_BLOCK_COMMENT
+                        elif (token == ";"):
+                            if (SqlScriptParser._is_escaped(line, re_result.start())): statement_parts.append(token)
+                            else:
+                                statement = "".join(statement_parts).strip()
+                                statement_parts = [ ]
+
+                                if (statement != ""): yield statement
+                            #
+                        else:
+                            statement_parts.append(token)
+
+                            quote = token
+                            state = SqlScriptParser.STATE_QUOTED
+                        #
+                    #
+                #
+            #
+        #
+
+        statement = "".join(statement_parts).strip()
+        if (statement != ""): yield statement
+    #
+
+    @staticmethod
+    def _is_escaped(line, position):
+        """
+Returns true if the character at the given position is preceded by an odd
+number of backslashes.
+
+:param line: Line
+:param position: Character position
+
+:return: (bool) True if escaped
+:since:  v1.0.0
+        """
+
+        backslashes = 0
+
+        while (position - backslashes > 0 and line[position - backslashes - 1] == "\\"): backslashes += 1
+
+        return ((backslashes % 2) == 1)
+    #
+#
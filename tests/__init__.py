@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;database
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;mpl2
+----------------------------------------------------------------------------
+#echo(pasDatabaseVersion)#
+#echo(__FILEPATH__)#
+"""
+
+from os import makedirs, path
+from tempfile import mkdtemp
+import json
+
+from dpt_file import File
+from dpt_settings import Settings
+
+_data_path = mkdtemp()
+_settings_path = path.join(_data_path, "settings")
+
+makedirs(_settings_path)
+
+_settings_file = File()
+
+if (_settings_file.open(path.join(_settings_path, "pas_database.json"), False, "w")):
+    _settings_file.write(json.dumps({ "pas_database_url": "sqlite:///{0}".format(path.join(_data_path, "tests.sqlite3")),
+                                     "pas_database_key_store_cache_size": 100,
+                                     "pas_database_statistics": True,
+                                     "pas_database_table_prefix": "tests",
+                                     "pas_database_threaded": False
+                                   }))
+
+    _settings_file.close()
+#
+
+# Settings are read on first use of "pas_database"
+Settings.set("path_data", _data_path)
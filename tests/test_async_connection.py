@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;database
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;mpl2
+----------------------------------------------------------------------------
+#echo(pasDatabaseVersion)#
+#echo(__FILEPATH__)#
+"""
+
+from asyncio import create_task, gather
+from os import path
+from unittest import IsolatedAsyncioTestCase, main, skipIf
+
+from dpt_runtime.io_exception import IOException
+from dpt_settings import Settings
+
+from sqlalchemy.sql.expression import text
+
+from pas_database import AsyncConnection, Connection
+
+try: import aiosqlite
+except ImportError: aiosqlite = None
+
+try: from sqlalchemy.ext.asyncio import AsyncSession
+except ImportError: AsyncSession = None
+
+@skipIf(aiosqlite is None or AsyncSession is None, "SQLAlchemy asyncio support or aiosqlite is not available")
+class TestAsyncConnection(IsolatedAsyncioTestCase):
+    """
+Tests for "AsyncConnection".
+
+:author:     direct Netware Group et al.
+:copyright:  (C) direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: database
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;mpl2
+             Mozilla Public License, v. 2.0
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+Configures the asyncio database URL.
+
+:since: v1.0.0
+        """
+
+        Connection._ensure_settings()
+
+        if (not Settings.is_defined("pas_database_async_url")):
+            Settings.set("pas_database_async_url", "sqlite+aiosqlite:///{0}".format(path.join(Settings.get("path_data"), "tests_async.sqlite3")))
+        #
+    #
+
+    async def _select(self):
+        """
+Enters a connection context and executes a query.
+
+:return: (int) Query result
+:since:  v1.0.0
+        """
+
+        async with AsyncConnection.get_instance() as connection:
+            return (await connection.execute(text("SELECT 1"))).scalar()
+        #
+    #
+
+    async def test_context(self):
+        """
+Tests entering a connection context.
+
+:since: v1.0.0
+        """
+
+        self.assertEqual(1, await self._select())
+        self.assertEqual(0, AsyncConnection.get_instance().get_transaction_depth())
+    #
+
+    async def test_tasks(self):
+        """
+Tests tasks entering connection contexts concurrently.
+
+:since: v1.0.0
+        """
+
+        self.assertEqual([ 1, 1, 1 ], await gather(self._select(), self._select(), self._select()))
+    #
+
+    async def test_task_created_within_context(self):
+        """
+Tests tasks created within an active connection context.
+
+:since: v1.0.0
+        """
+
+        async with AsyncConnection.get_instance():
+            task = create_task(self._select())
+
+            if (Connection.is_serialized()):
+                with self.assertRaises(IOException): await task
+            else: self.assertEqual(1, await task)
+        #
+
+        self.assertEqual(1, await create_task(self._select()))
+    #
+#
+
+if (__name__ == "__main__"): main()
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;database
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;mpl2
+----------------------------------------------------------------------------
+#echo(pasDatabaseVersion)#
+#echo(__FILEPATH__)#
+"""
+
+from unittest import TestCase, main
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm.session import Session
+from sqlalchemy.schema import Column
+from sqlalchemy.types import INTEGER, VARCHAR
+
+from pas_database.condition_definition import ConditionDefinition
+
+_Base = declarative_base()
+
+class _DbEntry(_Base):
+    """
+SQLAlchemy database class used for condition definition tests.
+    """
+
+    __tablename__ = "test_condition_definition"
+    """
+SQLAlchemy table name
+    """
+
+    id = Column(INTEGER, primary_key = True)
+    """
+test_condition_definition.id
+    """
+    key = Column(VARCHAR(255), nullable = False)
+    """
+test_condition_definition.key
+    """
+#
+
+class TestConditionDefinition(TestCase):
+    """
+Tests for "ConditionDefinition".
+
+:author:     direct Netware Group et al.
+:copyright:  (C) direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: database
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;mpl2
+             Mozilla Public License, v. 2.0
+    """
+
+    def setUp(self):
+        """
+Creates an in-memory SQLite database with test entries.
+
+:since: v1.0.0
+        """
+
+        engine = create_engine("sqlite://")
+        _Base.metadata.create_all(engine)
+
+        self.session = Session(engine)
+        self.session.add_all([ _DbEntry(id = position, key = key) for position, key in enumerate("abcd") ])
+        self.session.commit()
+    #
+
+    def tearDown(self):
+        """
+Closes the database session.
+
+:since: v1.0.0
+        """
+
+        self.session.close()
+    #
+
+    def _get_keys(self, query):
+        """
+Returns the sorted keys of the entries matched by the given query.
+
+:param query: SQLAlchemy query instance
+
+:return: (list) Sorted keys
+:since:  v1.0.0
+        """
+
+        return sorted(db_instance.key for db_instance in query)
+    #
+
+    def test_apply(self):
+        """
+Tests applying a condition definition.
+
+:since: v1.0.0
+        """
+
+        condition_definition = ConditionDefinition(ConditionDefinition.OR)
+        condition_definition.add_exact_match_condition("key", "a")
+        condition_definition.add_in_list_match_condition("key", [ "c", "d" ])
+
+        query = condition_definition.apply(_DbEntry, self.session.query(_DbEntry))
+        self.assertEqual([ "a", "c", "d" ], self._get_keys(query))
+    #
+
+    def test_apply_cached_shape_values(self):
+        """
+Tests that definitions of the same structure do not share values.
+
+:since: v1.0.0
+        """
+
+        for key in "abcd":
+            condition_definition = ConditionDefinition()
+            condition_definition.add_exact_match_condition("key", key)
+
+            query = condition_definition.apply(_DbEntry, self.session.query(_DbEntry))
+            self.assertEqual([ key ], self._get_keys(query))
+        #
+    #
+
+    def test_apply_multiple_to_one_query(self):
+        """
+Tests applying two definitions with colliding bind parameter positions to
+the same query.
+
+:since: v1.0.0
+        """
+
+        condition_definition = ConditionDefinition(ConditionDefinition.OR)
+        condition_definition.add_exact_match_condition("key", "a")
+        condition_definition.add_exact_match_condition("key", "c")
+
+        query = condition_definition.apply(_DbEntry, self.session.query(_DbEntry))
+
+        condition_definition = ConditionDefinition()
+        condition_definition.add_exact_match_condition("key", "c")
+
+        query = condition_definition.apply(_DbEntry, query)
+        self.assertEqual([ "c" ], self._get_keys(query))
+
+        condition_definition = ConditionDefinition()
+        condition_definition.add_in_list_match_condition("id", [ 1, 2 ])
+
+        query = condition_definition.apply(_DbEntry, self.session.query(_DbEntry))
+
+        condition_definition = ConditionDefinition()
+        condition_definition.add_in_list_match_condition("id", [ 2, 3 ])
+
+        query = condition_definition.apply(_DbEntry, query)
+        self.assertEqual([ "c" ], self._get_keys(query))
+    #
+#
+
+if (__name__ == "__main__"): main()
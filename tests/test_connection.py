@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;database
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;mpl2
+----------------------------------------------------------------------------
+#echo(pasDatabaseVersion)#
+#echo(__FILEPATH__)#
+"""
+
+from unittest import TestCase, main
+
+from sqlalchemy.sql.expression import text
+
+from pas_database import Connection, TransactionContext
+from pas_database.orm import Abstract
+from pas_database.orm.key_store import KeyStore as _DbKeyStore
+
+class TestConnection(TestCase):
+    """
+Tests for "Connection".
+
+:author:     direct Netware Group et al.
+:copyright:  (C) direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: database
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;mpl2
+             Mozilla Public License, v. 2.0
+    """
+
+    def setUp(self):
+        """
+Creates the database tables.
+
+:since: v1.0.0
+        """
+
+        Abstract().metadata.create_all(Connection.get_engine())
+    #
+
+    def tearDown(self):
+        """
+Removes all KeyStore entries.
+
+:since: v1.0.0
+        """
+
+        with Connection.get_instance() as connection: connection.query(_DbKeyStore).delete()
+    #
+
+    def test_context(self):
+        """
+Tests entering a connection context.
+
+:since: v1.0.0
+        """
+
+        with Connection.get_instance() as connection:
+            self.assertEqual(1, connection.get_context_depth())
+            self.assertEqual(1, connection.execute(text("SELECT 1")).scalar())
+        #
+
+        self.assertEqual(0, Connection.get_instance().get_context_depth())
+    #
+
+    def test_transaction_context(self):
+        """
+Tests committing and rolling back transactions.
+
+:since: v1.0.0
+        """
+
+        with TransactionContext():
+            Connection.get_instance().add(_DbKeyStore(key = "committed", value = "{}", validity_start_time = 0, validity_end_time = 0))
+        #
+
+        with self.assertRaises(RuntimeError):
+            with TransactionContext():
+                Connection.get_instance().add(_DbKeyStore(key = "rolled_back", value = "{}", validity_start_time = 0, validity_end_time = 0))
+                raise RuntimeError()
+            #
+        #
+
+        with Connection.get_instance() as connection:
+            self.assertEqual([ "committed" ], [ key for key, in connection.query(_DbKeyStore.key) ])
+        #
+    #
+#
+
+if (__name__ == "__main__"): main()
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;database
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;mpl2
+----------------------------------------------------------------------------
+#echo(pasDatabaseVersion)#
+#echo(__FILEPATH__)#
+"""
+
+from threading import Thread
+from unittest import TestCase, main
+
+from sqlalchemy.sql.expression import text
+
+from pas_database import Connection, ConnectionStatistics
+
+class TestConnectionStatistics(TestCase):
+    """
+Tests for "ConnectionStatistics".
+
+:author:     direct Netware Group et al.
+:copyright:  (C) direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: database
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;mpl2
+             Mozilla Public License, v. 2.0
+    """
+
+    def _execute_outside_context(self):
+        """
+Executes a query on the engine without a connection context.
+
+:since: v1.0.0
+        """
+
+        with Connection.get_engine().connect() as sa_connection: sa_connection.execute(text("SELECT 1"))
+    #
+
+    def test_context(self):
+        """
+Tests that queries executed after the connection context has been exited
+are not counted for it.
+
+:since: v1.0.0
+        """
+
+        with Connection.get_instance() as connection:
+            connection.execute(text("SELECT 1"))
+            self.assertEqual(1, ConnectionStatistics.get_context()['queries'])
+        #
+
+        queries = ConnectionStatistics.get()['queries']
+        self._execute_outside_context()
+
+        self.assertEqual(1, ConnectionStatistics.get_context()['queries'])
+        self.assertEqual(queries + 1, ConnectionStatistics.get()['queries'])
+    #
+
+    def test_threads(self):
+        """
+Tests merging the counters of all threads.
+
+:since: v1.0.0
+        """
+
+        ConnectionStatistics.reset()
+        self.assertEqual(0, ConnectionStatistics.get()['queries'])
+
+        self._execute_outside_context()
+
+        threads = [ Thread(target = self._execute_outside_context) for _ in range(3) ]
+
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+
+        self.assertEqual(4, ConnectionStatistics.get()['queries'])
+
+        ConnectionStatistics.reset()
+        self.assertEqual(0, ConnectionStatistics.get()['queries'])
+    #
+#
+
+if (__name__ == "__main__"): main()
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+"""
+direct PAS
+Python Application Services
+----------------------------------------------------------------------------
+(C) direct Netware Group - All rights reserved
+https://www.direct-netware.de/redirect?pas;database
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+----------------------------------------------------------------------------
+https://www.direct-netware.de/redirect?licenses;mpl2
+----------------------------------------------------------------------------
+#echo(pasDatabaseVersion)#
+#echo(__FILEPATH__)#
+"""
+
+from time import time
+from unittest import TestCase, main
+
+from dpt_runtime.io_exception import IOException
+from dpt_runtime.value_exception import ValueException
+
+from pas_database import Connection, TransactionContext
+from pas_database.instances import KeyStore
+from pas_database.orm import Abstract
+from pas_database.orm.key_store import KeyStore as _DbKeyStore
+
+class TestKeyStore(TestCase):
+    """
+Tests for "KeyStore".
+
+:author:     direct Netware Group et al.
+:copyright:  (C) direct Netware Group - All rights reserved
+:package:    pas
+:subpackage: database
+:since:      v1.0.0
+:license:    https://www.direct-netware.de/redirect?licenses;mpl2
+             Mozilla Public License, v. 2.0
+    """
+
+    def setUp(self):
+        """
+Creates the database tables with a valid and an expired entry.
+
+:since: v1.0.0
+        """
+
+        Abstract().metadata.create_all(Connection.get_engine())
+
+        with TransactionContext():
+            connection = Connection.get_instance()
+
+            connection.add(_DbKeyStore(key = "valid", value = "{}", validity_start_time = 0, validity_end_time = int(time()) + 3600))
+            connection.add(_DbKeyStore(key = "expired", value = "{}", validity_start_time = 0, validity_end_time = 1))
+        #
+    #
+
+    def tearDown(self):
+        """
+Removes all KeyStore entries.
+
+:since: v1.0.0
+        """
+
+        with Connection.get_instance() as connection: connection.query(_DbKeyStore).delete()
+    #
+
+    def _get_keys(self):
+        """
+Returns the sorted keys of all KeyStore entries.
+
+:return: (list) Sorted keys
+:since:  v1.0.0
+        """
+
+        with Connection.get_instance() as connection:
+            return sorted(key for key, in connection.query(_DbKeyStore.key))
+        #
+    #
+
+    def test_bulk_insert_upsert(self):
+        """
+Tests that upserted entries are not returned from the cache.
+
+:since: v1.0.0
+        """
+
+        row = { "key": "upserted", "value": { "v": 1 }, "validity_start_time": 0, "validity_end_time": 0 }
+
+        KeyStore.bulk_insert([ row ])
+        self.assertEqual({ "v": 1 }, KeyStore.load_key("upserted").value_dict)
+
+        row['value'] = { "v": 2 }
+
+        KeyStore.bulk_insert([ row ], [ "key" ])
+        self.assertEqual({ "v": 2 }, KeyStore.load_key("upserted").value_dict)
+
+        self.assertRaises(ValueException, KeyStore.bulk_insert, [ row ], [ "unknown" ])
+    #
+
+    def test_delete_expired(self):
+        """
+Tests deleting expired entries.
+
+:since: v1.0.0
+        """
+
+        self.assertEqual(1, KeyStore.get_expired_count())
+        self.assertEqual([ "expired", "valid" ], self._get_keys())
+
+        self.assertEqual(1, KeyStore.delete_expired())
+        self.assertEqual(0, KeyStore.get_expired_count())
+        self.assertEqual([ "valid" ], self._get_keys())
+
+        with Connection.get_instance():
+            self.assertRaises(IOException, KeyStore.delete_expired)
+        #
+    #
+
+    def test_load_key_without_writes(self):
+        """
+Tests that lookups neither delete expired entries nor commit changes of
+the active connection context.
+
+:since: v1.0.0
+        """
+
+        with Connection.get_instance() as connection:
+            connection.add(_DbKeyStore(key = "uncommitted", value = "{}", validity_start_time = 0, validity_end_time = 0))
+            connection.flush()
+
+            for _ in range(10): KeyStore.load_key("valid")
+
+            connection.rollback()
+        #
+
+        self.assertEqual([ "expired", "valid" ], self._get_keys())
+    #
+#
+
+if (__name__ == "__main__"): main()